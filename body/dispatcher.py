@@ -1,13 +1,13 @@
 # body/dispatcher.py
 # Tool imports
 from .tools.system_control import get_time, get_date
-from .tools.memory_management import remember_fact, recall_fact
 from memory.short_term import get_recent_history
-from memory.long_term import long_term_memory
 
 # API / client manager
 from brain.api_manager import api_manager
-from brain.llm_clients.openai_client import get_llm_response
+
+# The memory tools open the SQLite database and the OpenAI client loads its
+# library, so both are imported where first used rather than at startup
 
 # Google Keep is optional since we're skipping it for now
 google_keep_available = False
@@ -29,6 +29,12 @@ google_keep_available = False
 
 
 
+def get_openai_client():
+    """Shared OpenAI client, whose keys the api key commands keep in sync"""
+    from brain.llm_clients.openai_client import get_shared_client
+    return get_shared_client()
+
+
 def _parse_add_api_key(parts: list) -> tuple:
     """
     Parse parts after "add api key".
@@ -169,6 +175,7 @@ def dispatch_command(user_input: str):
                 return f"Error removing API key: {str(e)}"
 
     # Memory commands
+    from .tools.memory_management import remember_fact, recall_fact
     if any(word in user_input_lower for word in ["remember that", "my", "is", "i like", "i love", "my name is"]):
         memory_response = remember_fact(user_input)
         if memory_response and "didn't detect" not in memory_response:
@@ -193,6 +200,7 @@ def dispatch_command(user_input: str):
 
     if user_input_lower == "debug memory":
         try:
+            from memory.long_term import long_term_memory
             long_term_memory.add_fact("user", "test_attribute", "test_value")
             fact = long_term_memory.get_current_fact("user", "test_attribute")
             if fact and fact["value"] == "test_value":
@@ -166,7 +166,7 @@ def debug_database() -> str:
         
         # Get all current facts
         c.execute("""
-            SELECT subject, attribute, value, valid_from 
+            SELECT subject, attribute, value, datetime(valid_from, 'unixepoch', 'localtime')
             FROM facts 
             WHERE valid_until IS NULL
             ORDER BY subject, attribute
@@ -175,7 +175,8 @@ def debug_database() -> str:
         
         # Get some history
         c.execute("""
-            SELECT subject, attribute, value, valid_from, valid_until
+            SELECT subject, attribute, value,
+                   datetime(valid_from, 'unixepoch', 'localtime'), datetime(valid_until, 'unixepoch', 'localtime')
             FROM facts 
             WHERE valid_until IS NOT NULL
             ORDER BY valid_from DESC 
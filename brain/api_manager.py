@@ -231,7 +231,7 @@ class APIManager:
         """
         # Lazy import of settings so this module can be imported without config present.
         try:
-            from config import settings
+            from config.settings import settings
         except Exception:
             # if config package not available, skip import
             return 0
@@ -242,18 +242,15 @@ class APIManager:
         conn = sqlite3.connect(self.db_path)
         c = conn.cursor()
 
-        # Import from multiple keys (OPENAI_API_KEY_1 to _5)
-        for i in range(1, 6):
-            env_var_name = f"OPENAI_API_KEY_{i}"
-            if hasattr(settings, env_var_name):
-                api_key = getattr(settings, env_var_name)
-                if api_key:
-                    # Check if key already exists
-                    c.execute("SELECT id FROM api_keys WHERE api_key = ?", (api_key,))
-                    if not c.fetchone():  # Only add if not exists
-                        if self.add_api_key("openai", api_key, priority=i):
-                            imported_count += 1
-                            print(f"✅ Imported {env_var_name} (priority {i})")
+        # Import from multiple keys (OPENAI_API_KEY_1, OPENAI_API_KEY_2, ...)
+        # The variable's own number is the priority, even with gaps in the numbering
+        for i, api_key in settings.OPENAI_API_KEYS:
+            # Check if key already exists
+            c.execute("SELECT id FROM api_keys WHERE api_key = ?", (api_key,))
+            if not c.fetchone():  # Only add if not exists
+                if self.add_api_key("openai", api_key, priority=i):
+                    imported_count += 1
+                    print(f"✅ Imported OPENAI_API_KEY_{i} (priority {i})")
 
         conn.close()
 
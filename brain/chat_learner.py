@@ -4,12 +4,21 @@ import re
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from body.tools.memory_management import JARVISMemoryManager
+from memory.chat_logger import iter_session_files, read_session_messages, recompute_stats_batch, scan_session_entries
+from memory.long_term import long_term_memory
+
+def _message_epoch(message: Dict) -> int:
+    """When a logged message was written, as epoch seconds (now if the log has no time)"""
+    if "_ts_epoch" in message:
+        return int(message["_ts_epoch"])
+    try:
+        return int(datetime.fromisoformat(message["timestamp"]).timestamp())
+    except (KeyError, TypeError, ValueError):
+        return int(datetime.now().timestamp())
 
 class ChatHistoryLearner:
     def __init__(self, logs_dir: str = "memory/chat_sessions"):
         self.logs_dir = Path(logs_dir)
-        self.memory_manager = JARVISMemoryManager()
         self.learning_patterns = self._initialize_learning_patterns()
     
     def _initialize_learning_patterns(self) -> List[Dict]:
@@ -105,6 +114,7 @@ class ChatHistoryLearner:
             "sessions_processed": 0,
             "facts_learned": 0,
             "errors": 0,
+            "messages_processed": 0,
             "session_details": []
         }
         
@@ -112,13 +122,16 @@ class ChatHistoryLearner:
         
         for session_file in session_files:
             try:
-                session_facts = self._process_session_file(session_file)
+                stats = {}
+                session_facts = self._process_session_file(session_file, stats)
                 results["sessions_processed"] += 1
                 results["facts_learned"] += len(session_facts)
+                results["messages_processed"] += stats.get("total_messages", 0)
                 results["session_details"].append({
                     "session": session_file.name,
                     "facts_learned": len(session_facts),
-                    "facts": session_facts
+                    "facts": session_facts,
+                    "stats": stats
                 })
                 
             except Exception as e:
@@ -128,39 +141,62 @@ class ChatHistoryLearner:
         return results
     
     def _get_recent_session_files(self, days: int, max_sessions: int) -> List[Path]:
-        """Get list of recent session files, sorted by date (newest first)"""
+        """Get the most recent session files, oldest first so later sessions win"""
         session_files = []
         cutoff_time = datetime.now() - timedelta(days=days)
         
         # Get all session files and sort by modification time (newest first)
-        all_files = list(self.logs_dir.glob("session_*.json"))
-        all_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        all_entries = scan_session_entries(self.logs_dir)
+        all_entries.sort(key=lambda x: x.stat().st_mtime, reverse=True)
         
-        for session_file in all_files:
-            if datetime.fromtimestamp(session_file.stat().st_mtime) >= cutoff_time:
-                session_files.append(session_file)
+        for entry in all_entries:
+            if datetime.fromtimestamp(entry.stat().st_mtime) >= cutoff_time:
+                session_files.append(Path(entry.path))
                 if len(session_files) >= max_sessions:
                     break
         
+        session_files.reverse()
         return session_files
     
-    def _process_session_file(self, filepath: Path) -> List[Dict]:
-        """Extract learnings from a session file with pattern matching"""
+    def _process_session_file(self, filepath: Path, stats: Dict = None) -> List[Dict]:
+        """Extract learnings from a session file; fills stats with its message totals if given"""
         learned_facts = []
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
-            
-            messages = session_data.get('messages', [])
+            messages = read_session_messages(filepath)
+            if stats is not None:
+                stats.update(recompute_stats_batch(messages))
             
+            # Latest (value, valid_from) per attribute: stored, then as learned below
+            latest = {}
+            triples = []
             for message in messages:
                 if message.get('user') == 'user':  # Only learn from user messages
                     user_message = message.get('message', '')
                     if user_message:
+                        said_at = _message_epoch(message)
                         # Extract facts using pattern matching
-                        facts = self._extract_facts_with_patterns(user_message)
-                        learned_facts.extend(facts)
+                        for fact in self._extract_facts_with_patterns(user_message):
+                            attribute = fact["attribute"]
+                            if attribute not in latest:
+                                current = long_term_memory.get_current_fact("user", attribute)
+                                latest[attribute] = (
+                                    (current["value"], int(current["valid_from"].timestamp()))
+                                    if current else (None, None)
+                                )
+                            value, since = latest[attribute]
+                            # A repeated value would only add a duplicate version, and
+                            # an older statement must not replace a newer one
+                            if fact["value"] == value or (since is not None and said_at < since):
+                                continue
+                            latest[attribute] = (fact["value"], said_at)
+                            triples.append(("user", attribute, fact["value"], said_at))
+                            learned_facts.append(fact)
+            
+            # Store everything learned from this session in one transaction,
+            # each fact valid from when it was said
+            if triples and not long_term_memory.add_facts(triples):
+                return []
             
             return learned_facts
             
@@ -190,18 +226,13 @@ class ChatHistoryLearner:
                         # Default: use first capture group
                         value = match.group(1).strip() if match.groups() else match.group(0)
                     
-                    # Store the fact using memory manager
-                    result = self.memory_manager.remember_fact(
-                        f"user {attribute} is {value}"
-                    )
-                    
-                    if "stored" in result.lower() or "remembered" in result.lower():
-                        extracted_facts.append({
-                            "attribute": attribute,
-                            "value": value,
-                            "confidence": pattern_config.get("confidence", 0.7),
-                            "source_message": message[:100] + "..." if len(message) > 100 else message
-                        })
+                    # Collected here, stored per session by _process_session_file
+                    extracted_facts.append({
+                        "attribute": attribute,
+                        "value": value.strip(),
+                        "confidence": pattern_config.get("confidence", 0.7),
+                        "source_message": message[:100] + "..." if len(message) > 100 else message
+                    })
                         
             except Exception as e:
                 print(f"Error applying pattern {pattern_config.get('pattern')}: {e}")
@@ -211,14 +242,15 @@ class ChatHistoryLearner:
     
     def learn_from_specific_session(self, session_id: str) -> List[Dict]:
         """Learn from a specific session file"""
-        session_file = self.logs_dir / f"{session_id}.json"
-        if session_file.exists():
-            return self._process_session_file(session_file)
+        for suffix in (".jsonl", ".json"):
+            session_file = self.logs_dir / f"{session_id}{suffix}"
+            if session_file.exists():
+                return self._process_session_file(session_file)
         return []
     
     def get_learning_statistics(self) -> Dict[str, Any]:
         """Get statistics about available sessions and learning patterns"""
-        session_files = list(self.logs_dir.glob("session_*.json"))
+        session_files = iter_session_files(self.logs_dir)
         
         return {
             "total_sessions": len(session_files),
@@ -0,0 +1,55 @@
+"""
+Exact-match response cache: answers a prompt repeated with identical history from memory.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from brain.utils.config_loader import config_loader
+
+def is_cacheable_response(response: str) -> bool:
+    """Only successful LLM replies may be served again from a cache"""
+    return bool(response) and not response.startswith(("❌", config_loader.get_error_response()))
+
+class ExactCache:
+    def __init__(self, cache_file: str = "memory/exact_cache.json", max_entries: int = 2048):
+        self.cache_file = Path(cache_file)
+        self.max_entries = max_entries
+        self.entries: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        """Load persisted entries."""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"[exact_cache] Error loading cache: {e}")
+        return {}
+
+    def save(self):
+        """Persist entries to disk."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"[exact_cache] Error saving cache: {e}")
+
+    @staticmethod
+    def make_key(prompt: str, history: Optional[List[Dict]] = None) -> str:
+        """Hash the prompt together with the history it is answered in."""
+        payload = json.dumps({"p": prompt, "h": history or []}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, if any."""
+        return self.entries.get(key)
+
+    def put(self, key: str, response: str):
+        """Store a response, dropping the oldest entry when full."""
+        self.entries.pop(key, None)
+        self.entries[key] = response
+        if len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
@@ -5,10 +5,13 @@ Now with J.A.R.V.I.S. personality integration.
 """
 
 import os
+import threading
 import time
 import math
-from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import List, Dict, Any, Optional, Iterator
+
+# Importing settings loads .env once for the whole process
+import config.settings  # noqa: F401
 
 # Import utility classes
 from brain.llm_utils.token_tracker import TokenTracker
@@ -16,6 +19,7 @@ from brain.llm_utils.key_manager import KeyManager
 
 # Import personality config
 from brain.utils.config_loader import config_loader
+from brain.personality import EMOJI_RE, split_sentences
 
 try:
     from openai import (
@@ -35,7 +39,6 @@ class OpenAIClient:
         daily_token_limit: int = 100000,
         max_tokens_per_request: int = 2000,
     ):
-        load_dotenv()
         self.model = model
         self.max_retries_per_key = max_retries_per_key
         self.min_request_interval = min_request_interval
@@ -59,6 +62,11 @@ class OpenAIClient:
             {"key": k.strip(), "cooldown_until": 0.0, "bad": False} for k in raw_keys
         ]
 
+        # One OpenAI client per key, so its HTTP connection pool stays warm between requests
+        self._clients: Dict[str, OpenAI] = {}
+        # Requests may run in parallel threads; key selection must not interleave
+        self._key_lock = threading.Lock()
+
         print(f"[openai_client] Token usage: {self.token_tracker.data['tokens_used_today']}/{daily_token_limit} today")
         print(f"[openai_client] Personality: {self.personality.get_personality_traits()['name']}")
         print(f"[openai_client] Addressing user as: {self.user_address}")
@@ -88,16 +96,7 @@ class OpenAIClient:
 
     def _remove_emojis(self, text: str) -> str:
         """Remove emojis from text (J.A.R.V.I.S. doesn't use emojis)."""
-        import re
-        emoji_pattern = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "]+", flags=re.UNICODE
-        )
-        return emoji_pattern.sub(r'', text)
+        return EMOJI_RE.sub('', text)
 
     def _ensure_professional_tone(self, text: str) -> str:
         """Ensure response maintains J.A.R.V.I.S. professional tone."""
@@ -152,14 +151,28 @@ class OpenAIClient:
 
     def _select_and_apply_key(self) -> tuple:
         """Select and apply the next available API key."""
-        idx = self.key_manager.get_available_key_index()
-        if idx is None:
-            raise RuntimeError("All API keys are either on cooldown or invalid/blocked.")
-        
-        self.key_manager.current_index = idx
-        key = self.key_manager.keys_state[idx]["key"]
+        with self._key_lock:
+            idx = self.key_manager.get_available_key_index()
+            if idx is None:
+                raise RuntimeError("All API keys are either on cooldown or invalid/blocked.")
+            
+            self.key_manager.current_index = idx
+            key = self.key_manager.keys_state[idx]["key"]
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = OpenAI(api_key=key)
         print(f"[openai_client] Using key index {idx}.")
-        return idx, OpenAI(api_key=key)
+        return idx, client
+
+    def set_keys(self, keys: List[str]):
+        """Replace the rotation with the given keys, in priority order."""
+        keys = list(dict.fromkeys(k.strip() for k in keys if k and k.strip()))
+        if not keys:
+            raise ValueError("No OpenAI API keys given.")
+        self.key_manager.keys_state = [
+            {"key": k, "cooldown_until": 0.0, "bad": False} for k in keys
+        ]
+        self.key_manager.current_index = 0
 
     def get_token_usage_stats(self) -> Dict:
         """Get current token usage statistics."""
@@ -268,10 +281,8 @@ class OpenAIClient:
             # Use personality-specific error response
             return self.personality.get_error_response()
 
-def get_llm_response(user_input: str, context: list = None) -> str:
-    """Compatibility function for existing code with personality integration."""
-    client = OpenAIClient()
-
+def _build_context_messages(user_input: str, context: list = None) -> List[Dict[str, Any]]:
+    """Turn recent history plus the new input into chat messages."""
     messages = []
     if context:
         for exchange in context[-3:]:
@@ -279,6 +290,23 @@ def get_llm_response(user_input: str, context: list = None) -> str:
             messages.append({"role": "assistant", "content": exchange.get("ai", "")})
 
     messages.append({"role": "user", "content": user_input})
+    return messages
+
+_shared_client: Optional[OpenAIClient] = None
+
+def get_shared_client() -> OpenAIClient:
+    """Process-wide OpenAIClient, created on first use and reused so connections stay open."""
+    global _shared_client
+    if _shared_client is None:
+        # One interactive turn sends one request, so there is nothing to throttle
+        _shared_client = OpenAIClient(min_request_interval=0)
+    return _shared_client
+
+def get_llm_response(user_input: str, context: list = None) -> str:
+    """Compatibility function for existing code with personality integration."""
+    client = get_shared_client()
+
+    messages = _build_context_messages(user_input, context)
 
     try:
         response = client.chat_completion(messages=messages)
@@ -287,4 +315,32 @@ def get_llm_response(user_input: str, context: list = None) -> str:
         return client._apply_personality_post_processing(response_text)
     except Exception as e:
         # Use personality-specific error response
-        return client.personality.get_error_response() + f" Technical details: {str(e)}"
\ No newline at end of file
+        return client.personality.get_error_response() + f" Technical details: {str(e)}"
+
+def stream_llm_response(user_input: str, context: list = None) -> Iterator[str]:
+    """
+    Streaming variant of get_llm_response: yields reply text as it arrives.
+
+    Text is yielded a sentence at a time so personality post-processing sees
+    patterns that span tokens (such as "..."). Errors are raised to the caller
+    after any partial output, so a cut-off reply can be told from a whole one.
+    """
+    client = get_shared_client()
+
+    messages = _build_context_messages(user_input, context)
+
+    stream = client.chat_completion(
+        messages=messages, stream=True, stream_options={"include_usage": True}
+    )
+    buffer = ""
+    for chunk in stream:
+        # The final chunk carries usage and no choices
+        if getattr(chunk, "usage", None):
+            client.token_tracker.update_usage(chunk.usage.total_tokens)
+        if chunk.choices and chunk.choices[0].delta.content:
+            sentences, buffer = split_sentences(buffer + chunk.choices[0].delta.content)
+            for sentence in sentences:
+                # Trailing space keeps the sentence boundary for callers that re-split
+                yield client._apply_personality_post_processing(sentence) + " "
+    if buffer:
+        yield client._apply_personality_post_processing(buffer)
@@ -0,0 +1,123 @@
+"""
+Semantic response cache: answers near-duplicate prompts from earlier LLM replies.
+
+Entries are keyed on the prompt alone, so the cache is only consulted for
+prompts asked without chat history; follow-ups in a conversation always
+go to the LLM (or to the exact-match cache, which keys on history too).
+"""
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+class SemanticCache:
+    def __init__(
+        self,
+        cache_path: str = "memory/semantic_cache",
+        model_name: str = "all-MiniLM-L6-v2",
+        threshold: float = 0.92,
+        max_entries: int = 1024,
+    ):
+        self.matrix_file = Path(f"{cache_path}.npy")
+        self.responses_file = Path(f"{cache_path}.json")
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._model = None  # loaded on first lookup, it is the slow part of startup
+        self._disabled = False  # set for the session when the model cannot load or encode
+
+        # Normalized prompt embeddings in a fixed-size ring: rows [0, _size) are in
+        # use and _next is the row the next put overwrites (the oldest once full)
+        self.matrix: Optional[np.ndarray] = None
+        self.responses: List[str] = []
+        self._size = 0
+        self._next = 0
+        self._dirty = False
+        self._load()
+
+    def _allocate(self, dim: int):
+        """Create the embedding ring for vectors of the given size."""
+        self.matrix = np.empty((self.max_entries, dim), dtype=np.float32)
+
+    def _load(self):
+        """Load persisted embeddings and responses, if both files are present and agree."""
+        try:
+            if self.matrix_file.exists() and self.responses_file.exists():
+                matrix = np.load(self.matrix_file)
+                with open(self.responses_file, "r", encoding="utf-8") as f:
+                    responses = json.load(f)
+                if len(responses) == matrix.shape[0] and responses:
+                    # Files are written oldest first; keep the newest max_entries
+                    matrix = matrix[-self.max_entries:]
+                    self._allocate(matrix.shape[1])
+                    self._size = matrix.shape[0]
+                    self.matrix[:self._size] = matrix
+                    self.responses = responses[-self.max_entries:]
+                    self._next = self._size % self.max_entries
+        except Exception as e:
+            print(f"[semantic_cache] Error loading cache: {e}")
+
+    def save(self):
+        """Persist embeddings and responses side by side, oldest entry first."""
+        if not self._dirty:
+            return
+        try:
+            if self._size < self.max_entries:
+                order = np.arange(self._size)
+            else:
+                order = np.roll(np.arange(self._size), -self._next)
+            self.matrix_file.parent.mkdir(parents=True, exist_ok=True)
+            np.save(self.matrix_file, self.matrix[order])
+            with open(self.responses_file, "w", encoding="utf-8") as f:
+                json.dump([self.responses[i] for i in order], f, ensure_ascii=False)
+            self._dirty = False
+        except Exception as e:
+            print(f"[semantic_cache] Error saving cache: {e}")
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Return the unit-length embedding of text, or None once the model has failed."""
+        if self._disabled:
+            return None
+        try:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+            vector = self._model.encode(text, normalize_embeddings=True)
+            return np.asarray(vector, dtype=np.float32)
+        except Exception as e:
+            # Offline, hub down or a broken download: run without the cache
+            print(f"[semantic_cache] Error embedding prompt, cache disabled for this session: {e}")
+            self._disabled = True
+            return None
+
+    def lookup(self, prompt: str) -> Optional[str]:
+        """Return the cached response for the most similar prompt above the threshold."""
+        if not self._size:
+            return None
+
+        query = self._embed(prompt)
+        if query is None:
+            return None
+        scores = self.matrix[:self._size] @ query  # cosine similarity, rows are normalized
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self.responses[best]
+        return None
+
+    def put(self, prompt: str, response: str):
+        """Add a prompt/response pair, overwriting the oldest entry when full."""
+        vector = self._embed(prompt)
+        if vector is None:
+            return
+        if self.matrix is None:
+            self._allocate(vector.shape[0])
+        row = self._next
+        self.matrix[row] = vector
+        if self._size < self.max_entries:
+            self.responses.append(response)
+            self._size += 1
+        else:
+            self.responses[row] = response
+        self._next = (row + 1) % self.max_entries
+        self._dirty = True
@@ -2,10 +2,15 @@
 Token usage tracking with daily limits and persistence.
 """
 import json
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Any
 
+# Serializes read-modify-write of the usage file between threads; other processes'
+# updates are picked up because the file is re-read before every change
+_lock = threading.Lock()
+
 class TokenTracker:
     def __init__(self, daily_limit: int = 100000, data_file: str = "openai_token_usage.json"):
         self.daily_limit = daily_limit
@@ -27,24 +32,27 @@ class TokenTracker:
                 with open(self.data_file, "r") as f:
                     data = json.load(f)
 
-                # Reset daily counter if new day
-                current_date = time.strftime("%Y-%m-%d")
-                if data.get("last_reset_date") != current_date:
-                    data["tokens_used_today"] = 0
-                    data["request_count_today"] = 0
-                    data["last_reset_date"] = current_date
-
                 # Ensure all keys exist
                 for key in default_data:
                     if key not in data:
                         data[key] = default_data[key]
 
+                self._reset_if_new_day(data)
                 return data
         except Exception as e:
             print(f"[token_tracker] Error loading token usage: {e}")
 
         return default_data
 
+    @staticmethod
+    def _reset_if_new_day(data: Dict):
+        """Reset the daily counters once the date has changed."""
+        current_date = time.strftime("%Y-%m-%d")
+        if data.get("last_reset_date") != current_date:
+            data["tokens_used_today"] = 0
+            data["request_count_today"] = 0
+            data["last_reset_date"] = current_date
+
     def _save_data(self):
         """Save token usage data to file."""
         try:
@@ -55,6 +63,10 @@ class TokenTracker:
 
     def check_limits(self) -> tuple:
         """Check if token usage is within limits."""
+        with _lock:
+            # Pick up usage recorded by other clients; _load_data also rolls the day over,
+            # so a long-running session is not blocked after midnight
+            self.data = self._load_data()
         if self.data["tokens_used_today"] >= self.daily_limit:
             return (
                 False,
@@ -76,11 +88,14 @@ class TokenTracker:
 
     def update_usage(self, tokens_used: int):
         """Update token usage statistics."""
-        self.data["tokens_used_today"] += tokens_used
-        self.data["tokens_used_total"] += tokens_used
-        self.data["request_count_today"] += 1
-        self.data["request_count_total"] += 1
-        self._save_data()
+        with _lock:
+            # Start from the file, not this instance's copy, so no other writer's counts are lost
+            self.data = self._load_data()
+            self.data["tokens_used_today"] += tokens_used
+            self.data["tokens_used_total"] += tokens_used
+            self.data["request_count_today"] += 1
+            self.data["request_count_total"] += 1
+            self._save_data()
 
     def get_stats(self) -> Dict:
         """Get current token usage statistics."""
@@ -2,6 +2,7 @@
 """
 Orchestrator: routes tasks between tools, memory, and LLMs.
 """
+import asyncio
 
 # Choose ONE of these options:
 
@@ -9,7 +10,7 @@ Orchestrator: routes tasks between tools, memory, and LLMs.
 from brain.llm_clients.gemini_client import get_gemini_response
 
 # OPTION 2: Use OpenAI 
-from brain.llm_clients.openai_client import get_llm_response
+from brain.llm_clients.openai_client import get_llm_response, stream_llm_response
 
 # OPTION 3: Use DeepSeek
 # from brain.llm_clients.deepseek_client import get_deepseek_response
@@ -34,4 +35,36 @@ def route_task(user_input: str, context=None) -> str:
         
         return response
     except Exception as e:
-        return f"❌ LLM error: {str(e)}"
\ No newline at end of file
+        return f"❌ LLM error: {str(e)}"
+
+async def aroute_task_stream(user_input: str, context=None):
+    """
+    Stream the LLM reply piece by piece as an async iterator.
+    The blocking OpenAI stream is pumped from a worker thread into an
+    asyncio queue, so callers can speak early text while later text is
+    still being generated. A failure is re-raised to the caller after the
+    text received before it.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+
+    def pump():
+        try:
+            for token in stream_llm_response(user_input, context):
+                loop.call_soon_threadsafe(queue.put_nowait, token)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    worker = loop.run_in_executor(None, pump)
+    while True:
+        token = await queue.get()
+        if token is done:
+            break
+        if isinstance(token, Exception):
+            await worker
+            raise token
+        yield token
+    await worker
@@ -0,0 +1,59 @@
+# brain/personality.py
+"""
+J.A.R.V.I.S. personality: greetings, farewells and the filter applied to every reply.
+"""
+import re
+
+from brain.utils.config_loader import config_loader
+
+# Shared by every reply filter that strips emojis
+EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "]+", flags=re.UNICODE
+)
+
+# Boundary between complete sentences in a streamed reply
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(buffer):
+    """Split streamed text into its complete sentences and the unfinished remainder"""
+    *sentences, rest = SENTENCE_END.split(buffer)
+    return sentences, rest
+
+def _make_personality_filter(use_emojis):
+    """Build the reply filter for the given settings, with the settings baked in"""
+    if use_emojis:
+        def apply_personality_response(response):
+            """Apply J.A.R.V.I.S. personality filters to responses (emojis allowed)"""
+            return response
+    else:
+        def apply_personality_response(response):
+            """Apply J.A.R.V.I.S. personality filters to responses (emojis removed)"""
+            # Pure ASCII text cannot contain any emoji
+            return response if response.isascii() else EMOJI_RE.sub("", response)
+    return apply_personality_response
+
+# Reply filter specialised once at startup; rebuilt when the config is reloaded
+apply_personality_response = _make_personality_filter(config_loader.should_use_emojis())
+
+def refresh_personality_settings():
+    """Rebuild the reply filter after the config has been reloaded"""
+    global apply_personality_response
+    apply_personality_response = _make_personality_filter(config_loader.should_use_emojis())
+
+def get_personality_greeting():
+    """Get appropriate greeting based on time of day from personality config"""
+    return config_loader.get_greeting()
+
+def get_personality_farewell():
+    """Get personality-appropriate farewell message"""
+    return "Shutting down systems. Goodbye, Sir."
+
+def get_personality_mode_switch(mode):
+    """Get personality-appropriate mode switch message"""
+    status = "switching to text mode" if mode == "text" else "switching to voice mode"
+    return f"Understood, Sir. {status}."
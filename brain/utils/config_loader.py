@@ -1,15 +1,64 @@
 # brain/utils/config_loader.py
 import yaml
 import os
+import re
+import time
 import random
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+# Preference flags stored as booleans; everything else in jarvis.yaml is text
+BOOLEAN_PREFERENCES = ("use_emojis", "include_suggestions", "be_proactive", "barge_in")
+TRUE_STRINGS = {"true", "1", "yes"}
+
+# Bullet lines in the system prompt ("- ..." or "• ...") are response guidelines
+_GUIDELINE_LINE = re.compile(r"\s*[-•]")
+
 class ConfigLoader:
+    # Seconds between checks of the config file's modification time
+    RELOAD_CHECK_INTERVAL = 5.0
+    
     def __init__(self, config_path: str = "jarvis.yaml"):
         self.config_path = Path(config_path)
+        self._last_check = time.monotonic()
+        self._apply_config()
+    
+    def _apply_config(self):
+        """(Re)load the config file and rebuild everything derived from it"""
+        self._mtime = self._get_mtime()
         self.config = self._load_config()
+        self._flat = self._flatten(self.config)
+        self._system_prompt = self._build_system_prompt()
+        self._guidelines = tuple(
+            line.strip() for line in self._system_prompt.split('\n') if _GUIDELINE_LINE.match(line)
+        )
+    
+    def _get_mtime(self) -> Optional[float]:
+        """Modification time of the config file, or None if it is missing"""
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return None
+    
+    def invalidate(self):
+        """Drop memoized accessor results"""
+        for accessor in _CACHED_ACCESSORS:
+            getattr(ConfigLoader, accessor).cache_clear()
+    
+    def reload_if_changed(self) -> bool:
+        """Reload the config if the file changed; the stat runs at most once per interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.RELOAD_CHECK_INTERVAL:
+            return False
+        self._last_check = now
+        
+        if self._get_mtime() == self._mtime:
+            return False
+        self._apply_config()
+        self.invalidate()
+        return True
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
@@ -18,11 +67,30 @@ class ConfigLoader:
             return self._get_default_config()
         
         try:
+            # jarvis.yaml only holds strings, string lists and a few flags, so the
+            # base loader is enough and skips implicit type resolution entirely.
+            loader = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
             with open(self.config_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file) or {}
+                config = yaml.load(file, Loader=loader) or {}
         except Exception as e:
             print(f"❌ Error loading config: {e}")
             return self._get_default_config()
+        return self._coerce_booleans(config)
+    
+    def _coerce_booleans(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the known boolean preference flags from their string form"""
+        preferences = config.get("preferences")
+        if isinstance(preferences, dict):
+            for key in BOOLEAN_PREFERENCES:
+                if key in preferences:
+                    value = preferences[key]
+                    if isinstance(value, str):
+                        preferences[key] = value.strip().lower() in TRUE_STRINGS
+                    elif not isinstance(value, bool):
+                        # Drop the bad value so the accessor's default applies
+                        print(f"⚠️ preferences.{key} must be true or false, got {value!r}. Using default.")
+                        del preferences[key]
+        return config
     
     def _get_default_config(self) -> Dict[str, Any]:
         """Return default configuration if YAML file is missing"""
@@ -43,6 +111,10 @@ class ConfigLoader:
     
     def get_system_prompt(self) -> str:
         """Get the complete system prompt from config"""
+        return self._system_prompt
+    
+    def _build_system_prompt(self) -> str:
+        """Build the system prompt from config"""
         if "system_prompt" in self.config:
             return self.config["system_prompt"]
         
@@ -96,10 +168,12 @@ class ConfigLoader:
         
         return greeting
     
+    @lru_cache(maxsize=None)
     def get_error_response(self) -> str:
         """Get error response"""
         return self.config.get("behavior", {}).get("error_response", "My apologies, Sir. An error occurred.")
     
+    @lru_cache(maxsize=None)
     def get_unknown_response(self) -> str:
         """Get unknown query response"""
         return self.config.get("behavior", {}).get("unknown_response", "I'm not certain about that, Sir.")
@@ -141,46 +215,59 @@ class ConfigLoader:
         
         return completion_responses or "Task completed, Sir."
     
+    @lru_cache(maxsize=None)
     def should_use_emojis(self) -> bool:
         """Check if emojis should be used"""
         return self.config.get("preferences", {}).get("use_emojis", False)
     
+    @lru_cache(maxsize=None)
     def should_include_suggestions(self) -> bool:
         """Check if suggestions should be included"""
         return self.config.get("preferences", {}).get("include_suggestions", True)
     
+    @lru_cache(maxsize=None)
     def should_be_proactive(self) -> bool:
         """Check if proactive behavior is enabled"""
         return self.config.get("preferences", {}).get("be_proactive", False)
     
+    @lru_cache(maxsize=None)
+    def allow_barge_in(self) -> bool:
+        """Check if listening may start while a reply is still being spoken"""
+        return self.config.get("preferences", {}).get("barge_in", False)
+    
+    @lru_cache(maxsize=None)
     def get_user_address(self) -> str:
         """Get how to address the user"""
         return self.config.get("preferences", {}).get("address_user_as", "Sir")
     
+    @lru_cache(maxsize=None)
     def get_expertise(self) -> List[str]:
         """Get areas of expertise"""
         return self.config.get("knowledge", {}).get("expertise", [])
     
+    @lru_cache(maxsize=None)
     def get_avoid_topics(self) -> List[str]:
         """Get topics to avoid"""
         return self.config.get("knowledge", {}).get("avoid_topics", [])
     
+    @lru_cache(maxsize=None)
     def get_specialities(self) -> List[str]:
         """Get specialities"""
         return self.config.get("knowledge", {}).get("specialities", [])
     
+    def _flatten(self, config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Map every reachable dotted path (sections and leaves) to its value"""
+        flat = {}
+        for key, value in config.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(self._flatten(value, f"{path}."))
+        return flat
+    
     def get_property(self, path: str, default: Any = None) -> Any:
         """Get a nested property from config using dot notation"""
-        keys = path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(path, default)
     
     def get_personality_traits(self) -> Dict[str, Any]:
         """Get all personality traits"""
@@ -188,16 +275,14 @@ class ConfigLoader:
     
     def get_response_style_guidelines(self) -> List[str]:
         """Extract response guidelines from system prompt"""
-        system_prompt = self.get_system_prompt()
-        guidelines = []
-        
-        # Extract guidelines from system prompt
-        lines = system_prompt.split('\n')
-        for line in lines:
-            if line.strip().startswith('-') or line.strip().startswith('•'):
-                guidelines.append(line.strip())
-        
-        return guidelines
+        return list(self._guidelines)
+
+# Accessors memoized with lru_cache; cleared by ConfigLoader.invalidate()
+_CACHED_ACCESSORS = (
+    "get_error_response", "get_unknown_response", "should_use_emojis",
+    "should_include_suggestions", "should_be_proactive", "allow_barge_in", "get_user_address",
+    "get_expertise", "get_avoid_topics", "get_specialities",
+)
 
 # Singleton instance
 config_loader = ConfigLoader()
\ No newline at end of file
@@ -1,29 +1,37 @@
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (once, at first import)
 load_dotenv()
 
 
+def _numbered_keys(prefix: str) -> tuple:
+    """Collect (number, value) for each non-empty PREFIX_1, PREFIX_2, ..., ordered by number."""
+    found = []
+    for name, value in os.environ.items():
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and suffix.isdigit() and value:
+            found.append((int(suffix), value.strip()))
+    return tuple(sorted(found))
+
+
 class Settings:
-    """Application settings loaded from environment variables."""
-
-    # OpenAI API Configuration
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    # OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # ← ADD THIS LINE (legacy support)
-    
-    # DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
-    # ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+    """Application settings, snapshotted from the environment at import time."""
+
+    __slots__ = ()
+
+    # LLM provider keys
+    OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+    DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
+    ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
+
+    # Multiple API keys support: (n, key) for OPENAI_API_KEY_n, in priority order
+    OPENAI_API_KEYS = _numbered_keys("OPENAI_API_KEY_")
+
     # NewsAPI Configuration (for future use)
-    NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-    
-    # NEW: Multiple API keys support
-    # OPENAI_API_KEY_1 = os.getenv("OPENAI_API_KEY_1")
-    # OPENAI_API_KEY_2 = os.getenv("OPENAI_API_KEY_2")
-    # OPENAI_API_KEY_3 = os.getenv("OPENAI_API_KEY_3")
-    # OPENAI_API_KEY_4 = os.getenv("OPENAI_API_KEY_4")
-    # OPENAI_API_KEY_5 = os.getenv("OPENAI_API_KEY_5")
-    
+    NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
+
     # Add other configuration variables here as needed
 
 
@@ -1,11 +1,46 @@
 # groq_ai.py
 import os
 import time
-from typing import Optional, List, Dict, Any
-from groq import Groq
+from typing import Optional, List, Dict, Any, Iterator
+from groq import Groq, AsyncGroq
 from dotenv import load_dotenv
 from pathlib import Path
 import json
+from collections import OrderedDict, deque
+
+from brain.personality import split_sentences
+
+def _cap(text: str, limit: int) -> str:
+    """Truncate text to limit characters, reusing the original when it already fits"""
+    return text if len(text) <= limit else text[:limit]
+
+# .env discovery runs once per process, not once per GroqAI instance
+_ENV_LOADED = False
+
+def _find_env_path() -> Optional[str]:
+    """Return the first existing .env candidate, or None"""
+    for env_path in ('.env', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')):
+        try:
+            os.stat(env_path)
+            return env_path
+        except OSError:
+            continue
+    return None
+
+def _load_env_once():
+    """Load environment variables from .env on first use"""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    try:
+        env_path = _find_env_path()
+        if env_path:
+            load_dotenv(env_path)
+        else:
+            load_dotenv()
+    except:
+        pass
+    _ENV_LOADED = True
 
 class GroqAI:
     def __init__(self, api_key: Optional[str] = None, model: str = "llama-3.1-8b-instant"):
@@ -13,16 +48,7 @@ class GroqAI:
         Complete Groq AI integration for Jarvis
         """
         # Load environment variables
-        try:
-            possible_paths = [Path('.env'), Path(__file__).parent / '.env']
-            for env_path in possible_paths:
-                if env_path.exists():
-                    load_dotenv(env_path)
-                    break
-            else:
-                load_dotenv()
-        except:
-            pass
+        _load_env_once()
         
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         
@@ -31,9 +57,14 @@ class GroqAI:
         
         # Initialize Groq client
         self.client = Groq(api_key=self.api_key)
+        self._aclient = AsyncGroq(api_key=self.api_key)
         self.model = model
-        self.conversation_history = []
         self.max_history_length = 6  # Keep last 3 exchanges
+        self.conversation_history = deque(maxlen=self.max_history_length)
+        
+        # Responses to deterministic, history-free prompts
+        self._resp_cache = OrderedDict()
+        self.max_cache_entries = 64
         
         # Usage tracking
         self.usage_file = Path("groq_usage.json")
@@ -95,6 +126,76 @@ class GroqAI:
         
         return True, ""
     
+    def _cache_key(self, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                   temperature: float, use_history: bool) -> Optional[tuple]:
+        """Key for the response cache, or None if the request is not deterministic"""
+        if temperature > 0.01 or use_history:
+            return None
+        return (self.model, system_prompt, prompt, max_tokens)
+    
+    def _cache_get(self, key: Optional[tuple]) -> Optional[str]:
+        """Return a cached response and mark it as recently used"""
+        if key is None or key not in self._resp_cache:
+            return None
+        self._resp_cache.move_to_end(key)
+        return self._resp_cache[key]
+    
+    def _cache_put(self, key: Optional[tuple], response: str):
+        """Store a response, evicting the least recently used entry when full"""
+        if key is None:
+            return
+        self._resp_cache[key] = response
+        self._resp_cache.move_to_end(key)
+        if len(self._resp_cache) > self.max_cache_entries:
+            self._resp_cache.popitem(last=False)
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str], use_history: bool) -> List[Dict[str, str]]:
+        """Assemble the chat messages for a request"""
+        messages = []
+        
+        # System prompt
+        if system_prompt:
+            messages.append({"role": "system", "content": _cap(system_prompt, 400)})
+        
+        # Conversation history
+        if use_history and self.conversation_history:
+            for role, content in self.conversation_history:
+                messages.append({"role": role, "content": _cap(content, 200)})
+        
+        # Current message
+        messages.append({"role": "user", "content": _cap(prompt, 800)})
+        return messages
+    
+    def _record_request(self):
+        """Count a request against the limits (persisted once the outcome is known)"""
+        self.usage_data["total_requests"] += 1
+        self.usage_data["daily_requests"] += 1
+        self.usage_data["monthly_requests"] += 1
+        
+        # Track model usage
+        if self.model not in self.usage_data["model_usage"]:
+            self.usage_data["model_usage"][self.model] = 0
+        self.usage_data["model_usage"][self.model] += 1
+    
+    def _rollback_request(self):
+        """Undo the counters of a failed request"""
+        self.usage_data["total_requests"] = max(0, self.usage_data["total_requests"] - 1)
+        self.usage_data["daily_requests"] = max(0, self.usage_data["daily_requests"] - 1)
+        self.usage_data["monthly_requests"] = max(0, self.usage_data["monthly_requests"] - 1)
+        self.usage_data["model_usage"][self.model] = max(0, self.usage_data["model_usage"][self.model] - 1)
+    
+    def _finish_response(self, prompt: str, response: str, start_time: float) -> str:
+        """Persist usage and update history after a successful request"""
+        response_time = time.time() - start_time
+        self._save_usage_data()
+        
+        # Update history
+        self._update_history("user", _cap(prompt, 150))
+        self._update_history("assistant", _cap(response, 300))
+        
+        print(f"✅ Request {self.usage_data['daily_requests']}/{self.daily_limit} - {response_time:.1f}s")
+        return response
+    
     def get_response(self, 
                     prompt: str, 
                     system_prompt: Optional[str] = None, 
@@ -104,37 +205,20 @@ class GroqAI:
         """
         Get response from Groq AI with usage tracking
         """
+        # Repeated deterministic prompts are answered without spending quota
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, use_history)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         # Check usage limits
         can_proceed, reason = self._check_usage_limits()
         if not can_proceed:
             return f"⚠️ {reason}. Please try again later."
         
         try:
-            messages = []
-            
-            # System prompt
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt[:400]})
-            
-            # Conversation history
-            if use_history and self.conversation_history:
-                for role, content in self.conversation_history:
-                    messages.append({"role": role, "content": content[:200]})
-            
-            # Current message
-            messages.append({"role": "user", "content": prompt[:800]})
-            
-            # Update usage counters
-            self.usage_data["total_requests"] += 1
-            self.usage_data["daily_requests"] += 1
-            self.usage_data["monthly_requests"] += 1
-            
-            # Track model usage
-            if self.model not in self.usage_data["model_usage"]:
-                self.usage_data["model_usage"][self.model] = 0
-            self.usage_data["model_usage"][self.model] += 1
-            
-            self._save_usage_data()
+            messages = self._build_messages(prompt, system_prompt, use_history)
+            self._record_request()
             
             # API call
             start_time = time.time()
@@ -148,30 +232,121 @@ class GroqAI:
                 timeout=20
             )
             
-            response_time = time.time() - start_time
-            response = completion.choices[0].message.content
-            
-            # Update history
-            self._update_history("user", prompt[:150])
-            self._update_history("assistant", response[:300])
-            
-            print(f"✅ Request {self.usage_data['daily_requests']}/{self.daily_limit} - {response_time:.1f}s")
+            response = self._finish_response(prompt, completion.choices[0].message.content, start_time)
+            self._cache_put(cache_key, response)
             return response
             
         except Exception as e:
             # Rollback counters on error
-            self.usage_data["total_requests"] = max(0, self.usage_data["total_requests"] - 1)
-            self.usage_data["daily_requests"] = max(0, self.usage_data["daily_requests"] - 1)
-            self.usage_data["monthly_requests"] = max(0, self.usage_data["monthly_requests"] - 1)
-            self._save_usage_data()
+            self._rollback_request()
+            return f"❌ Error: {str(e)}"
+    
+    async def aget_response(self, 
+                           prompt: str, 
+                           system_prompt: Optional[str] = None, 
+                           max_tokens: int = 400,
+                           temperature: float = 0.7,
+                           use_history: bool = True) -> str:
+        """
+        Async variant of get_response, so callers can overlap the network
+        round-trip with local work (TTS playback, memory writes, listening)
+        """
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, use_history)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        can_proceed, reason = self._check_usage_limits()
+        if not can_proceed:
+            return f"⚠️ {reason}. Please try again later."
+        
+        try:
+            messages = self._build_messages(prompt, system_prompt, use_history)
+            self._record_request()
+            
+            start_time = time.time()
+            completion = await self._aclient.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1,
+                stream=False,
+                timeout=20
+            )
+            
+            response = self._finish_response(prompt, completion.choices[0].message.content, start_time)
+            self._cache_put(cache_key, response)
+            return response
             
+        except Exception as e:
+            self._rollback_request()
             return f"❌ Error: {str(e)}"
     
+    def stream_response(self, 
+                        prompt: str, 
+                        system_prompt: Optional[str] = None, 
+                        max_tokens: int = 400,
+                        temperature: float = 0.7,
+                        use_history: bool = True) -> Iterator[str]:
+        """
+        Stream a response from Groq AI one complete sentence at a time, so
+        speech can start while later tokens are still being generated
+        """
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens, temperature, use_history)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        
+        can_proceed, reason = self._check_usage_limits()
+        if not can_proceed:
+            yield f"⚠️ {reason}. Please try again later."
+            return
+        
+        messages = self._build_messages(prompt, system_prompt, use_history)
+        self._record_request()
+        
+        pieces = []
+        buffer = ""
+        try:
+            start_time = time.time()
+            completion = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=1,
+                stream=True,
+                timeout=20
+            )
+            
+            for chunk in completion:
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                pieces.append(delta)
+                buffer += delta
+                
+                # Emit every finished sentence, keep the trailing fragment
+                sentences, buffer = split_sentences(buffer)
+                for sentence in sentences:
+                    yield sentence
+            
+        except Exception as e:
+            self._rollback_request()
+            yield f"❌ Error: {str(e)}"
+            return
+        
+        if buffer.strip():
+            yield buffer.strip()
+        
+        response = self._finish_response(prompt, "".join(pieces), start_time)
+        self._cache_put(cache_key, response)
+    
     def _update_history(self, role: str, content: str):
         """Update conversation history"""
         self.conversation_history.append((role, content))
-        if len(self.conversation_history) > self.max_history_length:
-            self.conversation_history = self.conversation_history[-self.max_history_length:]
     
     def get_available_models(self) -> List[str]:
         """Get list of available models"""
@@ -208,7 +383,7 @@ class GroqAI:
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         return "✅ Conversation history cleared"
     
     def reset_usage_limits(self, daily_limit: int = None, monthly_limit: int = None):
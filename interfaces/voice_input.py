@@ -1,36 +1,52 @@
 # interfaces/voice_input.py
 import speech_recognition as sr
 
+# Reuse one recognizer so the calibrated energy threshold survives between commands
+recognizer = sr.Recognizer()
+
+# Ambient noise is measured once, then again only after repeated misses
+_ambient_calibrated = False
+_failed_recognitions = 0
+RECALIBRATE_AFTER_FAILURES = 3
+
 def listen_for_command():
     """
     Listens for and transcribes audio input from the microphone.
-    
+
     Returns:
         str: The transcribed text, or None if no audio was understood.
     """
-    recognizer = sr.Recognizer()
-    
+    global _ambient_calibrated, _failed_recognitions
+
     with sr.Microphone() as source:
         print("🎙️  Listening...")
         # Adjust for ambient noise
-        recognizer.adjust_for_ambient_noise(source, duration=0.5)
-        
+        if not _ambient_calibrated:
+            recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            _ambient_calibrated = True
+
         try:
             # Listen for audio input
             audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
             print("Processing audio...")
-            
+
             # Convert speech to text
             text = recognizer.recognize_google(audio)
             print(f"You said: {text}")
+            _failed_recognitions = 0
             return text.lower()
-            
+
         except sr.WaitTimeoutError:
             print("No speech detected within the timeout period.")
             return None
         except sr.UnknownValueError:
             print("Could not understand the audio.")
+            # The noise floor may have changed; measure it again on the next listen
+            _failed_recognitions += 1
+            if _failed_recognitions >= RECALIBRATE_AFTER_FAILURES:
+                _ambient_calibrated = False
+                _failed_recognitions = 0
             return None
         except Exception as e:
             print(f"An error occurred: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -1,25 +1,82 @@
 # interfaces/voice_output.py
+import asyncio
+import queue
+import threading
+
 import pyttsx3
 
-# Initialize the TTS engine once
-engine = pyttsx3.init()
+# Pending (text, on_done) utterances, played in order by the background speech thread
+_q = queue.Queue()
+
+def _speech_worker():
+    """Background worker that plays queued utterances one after another."""
+    # The SAPI5/NSSS drivers are bound to the thread that creates the engine,
+    # so it is initialized here rather than at import time.
+    try:
+        engine = pyttsx3.init()
+
+        # Configure voice properties (optional)
+        voices = engine.getProperty('voices')
+        if len(voices) > 1:
+            engine.setProperty('voice', voices[1].id)  # Typically index 1 is a female voice
+        engine.setProperty('rate', 180)  # Speech speed
+    except Exception as e:
+        # Keep draining the queue so wait_until_done() never blocks forever
+        print(f"Error initializing speech engine: {e}")
+        engine = None
+
+    while True:
+        text, on_done = _q.get()
+        try:
+            if engine:
+                engine.say(text)
+                engine.runAndWait()
+        except Exception as e:
+            print(f"Error in speech synthesis: {e}")
+        finally:
+            if on_done:
+                on_done()
+            _q.task_done()
 
-# Configure voice properties (optional)
-voices = engine.getProperty('voices')
-if voices:
-    engine.setProperty('voice', voices[1].id)  # Typically index 1 is a female voice
-engine.setProperty('rate', 180)  # Speech speed
+_speech_thread = threading.Thread(target=_speech_worker, daemon=True)
+_speech_thread.start()
 
 def speak(text):
     """
-    Converts text to speech and plays it aloud.
-    
+    Queues text to be spoken aloud and returns immediately.
+
     Args:
         text (str): The text to be spoken.
     """
-    try:
-        print(f"AI: {text}")  # Also print to console
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"Error in speech synthesis: {e}")
\ No newline at end of file
+    print(f"AI: {text}")  # Also print to console
+    _q.put((text, None))
+
+async def speak_stream(chunks, max_concurrent=3):
+    """
+    Speaks text chunks from an async iterator in their original order.
+
+    Chunks are handed to the speech thread as soon as they arrive, so each
+    one starts right after the previous finishes, with at most
+    max_concurrent chunks waiting ahead of playback. Returns once the last
+    chunk is queued; use wait_until_done() to wait for playback.
+
+    Args:
+        chunks: Async iterator of text chunks.
+        max_concurrent (int): How many chunks may be queued ahead of playback.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_concurrent)
+
+    def release():
+        loop.call_soon_threadsafe(slots.release)
+
+    async for chunk in chunks:
+        await slots.acquire()
+        print(f"AI: {chunk}")
+        _q.put((chunk, release))
+
+def wait_until_done():
+    """
+    Blocks until every queued utterance has finished playing.
+    """
+    _q.join()
@@ -1,25 +1,57 @@
 # main.py
-from brain.orchestrator import route_task
+import asyncio
+from importlib.util import find_spec
+
 from body.dispatcher import dispatch_command
 from interfaces.input_manager import get_user_input, select_interface_mode
-from interfaces.voice_output import speak
+from interfaces.voice_output import speak, speak_stream, wait_until_done
 from memory.short_term import add_to_history, get_recent_history
-from memory.long_term import long_term_memory
 from brain.api_manager import api_manager
-from brain.llm_clients.deepseek_client import get_deepseek_response as get_llm_response
 
 # Import J.A.R.V.I.S. personality configuration
 from brain.utils.config_loader import config_loader
+from brain import personality
+from brain.personality import (
+    get_personality_farewell, get_personality_greeting,
+    get_personality_mode_switch, refresh_personality_settings, split_sentences,
+)
 
-# NEW: Import chat logging and learning modules
+# NEW: Import chat logging module (the learner is imported when first needed)
 try:
     from memory.chat_logger import ChatLogger
-    from brain.chat_learner import ChatHistoryLearner
     CHAT_LOGGING_AVAILABLE = True
 except ImportError as e:
     CHAT_LOGGING_AVAILABLE = False
     print(f"ℹ️  Chat logging modules not available: {e} - continuing without them")
 
+# Exact-match response cache (L1, in front of the semantic cache)
+from brain.llm_clients.exact_cache import ExactCache, is_cacheable_response
+
+# Optional semantic response cache (needs numpy + sentence-transformers).
+# Only probe for the packages here; importing them is deferred until main() runs.
+SEMANTIC_CACHE_AVAILABLE = all(find_spec(name) for name in ("numpy", "sentence_transformers"))
+if not SEMANTIC_CACHE_AVAILABLE:
+    print("ℹ️  Semantic cache not available (numpy/sentence-transformers missing) - continuing without it")
+
+# Heavy modules (LLM clients, chat learner) are imported on first use to keep startup fast
+_aroute_task_stream = None
+_chat_learner = None
+
+def aroute_task_stream(*args, **kwargs):
+    """Stream an LLM reply, importing the orchestrator and its clients on first use"""
+    global _aroute_task_stream
+    if _aroute_task_stream is None:
+        from brain.orchestrator import aroute_task_stream as _aroute_task_stream
+    return _aroute_task_stream(*args, **kwargs)
+
+def learn_from_recent_chats():
+    """Learn facts from recent chat sessions, creating the learner on first use"""
+    global _chat_learner
+    if _chat_learner is None:
+        from brain.chat_learner import ChatHistoryLearner
+        _chat_learner = ChatHistoryLearner()
+    return _chat_learner.learn_from_recent_sessions(days=3, max_sessions=10)
+
 # Force import API keys from .env on startup
 imported_count = api_manager.import_keys_from_env()
 if imported_count > 0:
@@ -30,41 +62,135 @@ else:
 # Register cleanup function
 import atexit
 
-def get_personality_greeting():
-    """Get appropriate greeting based on time of day from personality config"""
-    return config_loader.get_greeting()
-
-def get_personality_farewell():
-    """Get personality-appropriate farewell message"""
-    return "Shutting down systems. Goodbye, Sir."
-
-def get_personality_mode_switch(mode):
-    """Get personality-appropriate mode switch message"""
-    status = "switching to text mode" if mode == "text" else "switching to voice mode"
-    return f"Understood, Sir. {status}."
-
-def apply_personality_response(response):
-    """Apply J.A.R.V.I.S. personality filters to responses"""
-    # Remove emojis if disabled
-    if not config_loader.should_use_emojis():
-        import re
-        emoji_pattern = re.compile(
-            "["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "]+", flags=re.UNICODE
-        )
-        response = emoji_pattern.sub(r'', response)
-    
-    return response
-
-def main():
+# Control commands recognised in the main loop
+_EXIT_CMDS = frozenset({"quit", "exit", "shutdown"})
+_SWITCH_CMDS = frozenset({"switch mode", "change mode"})
+
+# Streamed replies are spoken in sentence-sized pieces of at most this many characters
+MAX_SPEECH_CHUNK = 150
+
+def split_speech_chunks(buffer):
+    """Split streamed text into chunks ready to speak and the unfinished remainder"""
+    chunks, rest = split_sentences(buffer)
+    while len(rest) >= MAX_SPEECH_CHUNK:
+        cut = rest.rfind(" ", 0, MAX_SPEECH_CHUNK)
+        if cut <= 0:
+            cut = MAX_SPEECH_CHUNK
+        chunks.append(rest[:cut])
+        rest = rest[cut:].lstrip()
+    return chunks, rest
+
+async def stream_llm_reply(user_input, recent_history, mode):
+    """
+    Stream the LLM reply and output it chunk by chunk while it is generated.
+
+    Returns:
+        tuple: (raw reply, reply after personality filters, whether the
+        stream completed); a failed stream's reply ends with the error message
+    """
+    chunks = asyncio.Queue()
+    tokens = []
+    error = None
+
+    async def produce():
+        nonlocal error
+        buffer = ""
+        try:
+            try:
+                async for token in aroute_task_stream(user_input, context=recent_history):
+                    tokens.append(token)
+                    ready, buffer = split_speech_chunks(buffer + token)
+                    for chunk in ready:
+                        await chunks.put(chunk)
+            except Exception as e:
+                # Output what arrived, then the error; the caller must not cache it
+                error = f"{config_loader.get_error_response()} Technical details: {e}"
+                buffer = f"{buffer} {error}"
+            if buffer.strip():
+                await chunks.put(buffer.strip())
+        finally:
+            await chunks.put(None)
+
+    async def personality_chunks():
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            yield personality.apply_personality_response(chunk)
+
+    async def consume():
+        if mode == "voice":
+            await speak_stream(personality_chunks())
+            return
+        first = True
+        async for chunk in personality_chunks():
+            print(f"AI: {chunk}" if first else chunk, end=" ", flush=True)
+            first = False
+        if not first:
+            print()
+
+    await asyncio.gather(produce(), consume())
+    response = "".join(tokens)
+    if error:
+        response = f"{response.rstrip()} {error}".lstrip()
+    return response, personality.apply_personality_response(response), error is None
+
+def build_reply_pipeline(exact_cache, semantic_cache=None):
+    """
+    Assemble the stages that answer user input, in the order they are tried.
+
+    Each stage is an async callable (user_input, mode) returning None to pass,
+    or (response, personality_response); personality_response is None when the
+    reply still has to be filtered and output by the caller.
+    """
+    async def tools(user_input, mode):
+        response = dispatch_command(user_input)
+        return None if response is None else (response, None)
+
+    async def cached_llm(user_input, mode):
+        # Get recent history for context
+        recent_history = get_recent_history()
+
+        # L1: the same prompt with the same history was answered before
+        cache_key = ExactCache.make_key(user_input, recent_history)
+        response = exact_cache.get(cache_key)
+        if response is not None:
+            return response, None
+
+        # L2: stateless prompts may be answered from an earlier, similar prompt;
+        # with history in play a cached answer could leak the wrong context
+        use_semantic_cache = semantic_cache is not None and not recent_history
+        hit = await asyncio.to_thread(semantic_cache.lookup, user_input) if use_semantic_cache else None
+
+        personality_response = None
+        completed = True
+        if hit:
+            response = hit
+        else:
+            # Pass history to LLM and output the reply while it streams in
+            response, personality_response, completed = await stream_llm_reply(user_input, recent_history, mode)
+
+        # A stream cut off part-way is never cached, even if it began normally
+        if completed and is_cacheable_response(response):
+            exact_cache.put(cache_key, response)
+            if use_semantic_cache and not hit:
+                await asyncio.to_thread(semantic_cache.put, user_input, response)
+        return response, personality_response
+
+    return [tools, cached_llm]
+
+async def run_reply_pipeline(pipeline, user_input, mode):
+    """Run the pipeline stages in order until one of them answers"""
+    for stage in pipeline:
+        reply = await stage(user_input, mode)
+        if reply is not None:
+            return reply
+    return config_loader.get_unknown_response(), None
+
+async def main():
     # NEW: Initialize chat logging and learning if available
     if CHAT_LOGGING_AVAILABLE:
         chat_logger = ChatLogger()
-        chat_learner = ChatHistoryLearner()
         chat_logger.start_new_session()
         message_count = 0
         learn_counter = 0
@@ -72,7 +198,17 @@ def main():
         # Register cleanup
         atexit.register(chat_logger.stop)
 
-    mode = select_interface_mode()
+    exact_cache = ExactCache()
+    atexit.register(exact_cache.save)
+    semantic_cache = None
+    if SEMANTIC_CACHE_AVAILABLE:
+        from brain.llm_clients.semantic_cache import SemanticCache
+        semantic_cache = SemanticCache()
+        atexit.register(semantic_cache.save)
+
+    reply_pipeline = build_reply_pipeline(exact_cache, semantic_cache)
+
+    mode = await asyncio.to_thread(select_interface_mode)
 
     # Use personality-specific greeting
     greeting = get_personality_greeting()
@@ -86,7 +222,16 @@ def main():
         chat_logger.log_message("ai", greeting)
 
     while True:
-        user_input = get_user_input(mode)
+        # With barge-in the microphone opens while the last reply is still playing,
+        # hiding listen/recognition start-up behind speech; otherwise the speakers
+        # would be picked up, so wait for playback to end first
+        if mode == "voice" and not config_loader.allow_barge_in():
+            await asyncio.to_thread(wait_until_done)
+        user_input = await asyncio.to_thread(get_user_input, mode)
+
+        # Pick up edits to jarvis.yaml without restarting
+        if config_loader.reload_if_changed():
+            refresh_personality_settings()
         if not user_input:
             if mode == "voice":
                 continue
@@ -98,11 +243,14 @@ def main():
             chat_logger.log_message("user", user_input)
             message_count += 1
 
-        if user_input.lower() in ["quit", "exit", "shutdown"]:
+        lowered = user_input.lower()
+        if lowered in _EXIT_CMDS:
             # Use personality-specific farewell
             farewell = get_personality_farewell()
             if mode == "voice":
                 speak(farewell)
+                # Let the farewell finish playing before the process exits
+                await asyncio.to_thread(wait_until_done)
             else:
                 print(f"AI: {farewell}")
             
@@ -111,11 +259,11 @@ def main():
                 chat_logger.log_message("ai", farewell)
                 chat_logger.save_session()
                 if learn_counter >= 24:  # Learn once per day equivalent
-                    learning_results = chat_learner.learn_from_recent_sessions(days=3, max_sessions=10)
+                    learning_results = await asyncio.to_thread(learn_from_recent_chats)
                     print(f"📚 Learned {learning_results['facts_learned']} facts from {learning_results['sessions_processed']} sessions")
             break
 
-        if user_input.lower() in ["switch mode", "change mode"]:
+        if lowered in _SWITCH_CMDS:
             mode = "text" if mode == "voice" else "voice"
             # Use personality-specific mode switch message
             mode_message = get_personality_mode_switch(mode)
@@ -129,25 +277,18 @@ def main():
                 chat_logger.log_message("ai", mode_message)
             continue
 
-        # Process command (EXISTING CODE UNCHANGED)
-        tool_response = dispatch_command(user_input)
-
-        if tool_response is not None:
-            response = tool_response
-        else:
-            # Get recent history for context
-            recent_history = get_recent_history()
-            # Pass history to LLM for contextual responses
-            response = route_task(user_input, context=recent_history)
+        # Process command: the first pipeline stage with an answer wins
+        response, personality_response = await run_reply_pipeline(reply_pipeline, user_input, mode)
 
-        # Apply J.A.R.V.I.S. personality to the response
-        personality_response = apply_personality_response(response)
+        if personality_response is None:
+            # Apply J.A.R.V.I.S. personality to the response
+            personality_response = personality.apply_personality_response(response)
 
-        # Output response
-        if mode == "voice":
-            speak(personality_response)
-        else:
-            print(f"AI: {personality_response}")
+            # Output response
+            if mode == "voice":
+                speak(personality_response)
+            else:
+                print(f"AI: {personality_response}")
 
         # Add to conversation history (EXISTING CODE UNCHANGED)
         add_to_history(user_input, personality_response)
@@ -165,9 +306,10 @@ def main():
             # Learn from chats every 24 messages (simulating once per day)
             learn_counter += 1
             if learn_counter >= 24:
-                learning_results = chat_learner.learn_from_recent_sessions(days=3, max_sessions=10)
+                learning_results = await asyncio.to_thread(learn_from_recent_chats)
                 print(f"📚 Learned {learning_results['facts_learned']} facts from {learning_results['sessions_processed']} sessions")
                 learn_counter = 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # One event loop for the whole session
+    asyncio.run(main())
\ No newline at end of file
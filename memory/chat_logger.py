@@ -1,10 +1,74 @@
 # memory/chat_logger.py
-import json
-from datetime import datetime
+import os
+import orjson
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any
 import threading
-import time
+
+# Optional: vectorized length counting for bulk statistics. numpy is imported
+# on first use so that logging a chat never pays its import cost.
+_np = None
+
+def _get_numpy():
+    """numpy module, or False when it is not installed"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np
+
+def scan_session_entries(logs_dir: Path) -> List[os.DirEntry]:
+    """List session logs as DirEntry objects, whose stat() result is cached after the first call"""
+    entries = []
+    try:
+        it = os.scandir(logs_dir)
+    except FileNotFoundError:
+        return entries
+    with it:
+        for entry in it:
+            name = entry.name
+            if not name.startswith("session_") or name.endswith(".meta.json"):
+                continue
+            if name.endswith(".jsonl") or name.endswith(".json"):
+                entries.append(entry)
+    return entries
+
+def iter_session_files(logs_dir: Path) -> List[Path]:
+    """List session logs: append-only .jsonl files plus legacy single-document .json files"""
+    return [Path(entry.path) for entry in scan_session_entries(logs_dir)]
+
+def read_session_messages(filepath: Path) -> List[Dict]:
+    """Read the messages of a session log in either format"""
+    with open(filepath, 'rb') as f:
+        if filepath.suffix == ".jsonl":
+            return [orjson.loads(line) for line in f if line.strip()]
+        return orjson.loads(f.read()).get('messages', [])
+
+def _total_chars(texts: List[str]) -> int:
+    """Sum the lengths of many strings"""
+    np = _get_numpy() if texts else None
+    if np:
+        return int(np.char.str_len(np.array(texts, dtype=str)).sum())
+    return sum(map(len, texts))
+
+def recompute_stats_batch(messages: List[Dict]) -> Dict[str, int]:
+    """Recompute session totals for a whole list of logged messages at once"""
+    user_texts = [m.get('message') or '' for m in messages if m.get('user') == 'user']
+    ai_texts = [m.get('response') or '' for m in messages if m.get('user') == 'ai']
+    return {
+        "total_messages": len(messages),
+        "user_messages": len(user_texts),
+        "ai_messages": len(ai_texts),
+        "total_user_chars": _total_chars(user_texts),
+        "total_ai_chars": _total_chars(ai_texts),
+        # Joining with a space keeps word boundaries, so one split counts every message
+        "total_user_words": len(" ".join(user_texts).split()),
+        "total_ai_words": len(" ".join(ai_texts).split()),
+    }
 
 class ChatLogger:
     def __init__(self, logs_dir: str = "memory/chat_sessions"):
@@ -12,14 +76,37 @@ class ChatLogger:
         self.logs_dir.mkdir(parents=True, exist_ok=True)
         self.current_session: List[Dict] = []
         self.session_start_time = None
+        self.session_id = None
         self.auto_save_interval = 300  # seconds between auto-saves
         self._stop_auto_save = False
-        self._auto_save_thread = None
+        self._timer = None
+        self._lock = threading.Lock()  # guards the session list, counters and log file
+        self._fh = None  # append-only message log, opened on the first message
+        self._reset_counters()
+    
+    def _reset_counters(self):
+        """Reset the running per-session statistics"""
+        self._user_messages = 0
+        self._ai_messages = 0
+        self._user_chars = 0
+        self._ai_chars = 0
+        self._user_words = 0
+        self._ai_words = 0
+    
+    def _close_log_file(self):
+        """Flush and close the current session's message log"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
         
     def start_new_session(self):
         """Start a new chat session with auto-saving"""
+        self._close_log_file()
         self.current_session = []
         self.session_start_time = datetime.now()
+        self.session_id = f"session_{self.session_start_time.strftime('%Y%m%d_%H%M%S')}"
+        self._reset_counters()
         self._start_auto_save()
         print("💬 New chat session started")
     
@@ -34,74 +121,89 @@ class ChatLogger:
             "message_length": len(message),
             "response_length": len(response) if response else 0,
             "message_words": len(message.split()),
-            "response_words": len(response.split()) if response else 0
+            "response_words": len(response.split()) if response else 0,
+            "_ts_epoch": timestamp.timestamp()  # lets durations skip re-parsing "timestamp"
         }
-        self.current_session.append(entry)
-        
-        # Auto-save if session is getting large
-        if len(self.current_session) % 20 == 0:  # Every 5 messages
-            self.save_session(autosave=True)
+        with self._lock:
+            self.current_session.append(entry)
+            
+            # Keep running totals so saving never rescans the session
+            if user == 'user':
+                self._user_messages += 1
+                self._user_chars += entry["message_length"]
+                self._user_words += entry["message_words"]
+            elif user == 'ai':
+                self._ai_messages += 1
+                self._ai_chars += entry["response_length"]
+                self._ai_words += entry["response_words"]
+            
+            # Append the entry to the session log (one JSON object per line)
+            if self._fh is None:
+                if self.session_id is None:
+                    self.session_id = f"session_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+                self._fh = open(self.logs_dir / f"{self.session_id}.jsonl", 'ab')
+            self._fh.write(orjson.dumps(entry) + b"\n")
     
     def _start_auto_save(self):
-        """Start background thread for automatic session saving"""
-        if self._auto_save_thread and self._auto_save_thread.is_alive():
-            self._stop_auto_save = True
-            self._auto_save_thread.join(timeout=1.0)
+        """Start periodic automatic session saving"""
+        if self._timer:
+            self._timer.cancel()
         
         self._stop_auto_save = False
-        self._auto_save_thread = threading.Thread(target=self._auto_save_worker, daemon=True)
-        self._auto_save_thread.start()
+        self._schedule_auto_save()
+    
+    def _schedule_auto_save(self):
+        """Arm a one-shot timer for the next automatic save"""
+        self._timer = threading.Timer(self.auto_save_interval, self._auto_save_tick)
+        self._timer.daemon = True
+        self._timer.start()
     
-    def _auto_save_worker(self):
-        """Background worker for automatic saving"""
-        while not self._stop_auto_save:
-            time.sleep(self.auto_save_interval)
-            if self.current_session:
-                self.save_session(autosave=True)
+    def _auto_save_tick(self):
+        """Save the session, then schedule the next automatic save"""
+        if self._stop_auto_save:
+            return
+        if self.current_session:
+            self.save_session(autosave=True)
+        self._schedule_auto_save()
     
     def save_session(self, autosave: bool = False):
-        """Save current session to file with enhanced metadata"""
-        if not self.current_session:
+        """Flush the session log; manual saves also write the metadata sidecar"""
+        with self._lock:
+            return self._save_session_locked(autosave)
+    
+    def _save_session_locked(self, autosave: bool):
+        """save_session body; the caller holds self._lock"""
+        if not self.current_session or self._fh is None:
             return None
         
         try:
-            timestamp = datetime.now()
-            filename = f"session_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = self.logs_dir / filename
+            self._fh.flush()
+            filepath = self.logs_dir / f"{self.session_id}.jsonl"
             
-            # Calculate statistics
-            user_messages = [m for m in self.current_session if m['user'] == 'user']
-            ai_messages = [m for m in self.current_session if m['user'] == 'ai']
+            if autosave:
+                print(f"💾 Autosaved session: {filepath.name}")
+                return filepath
             
-            session_data = {
-                "metadata": {
-                    "session_id": filename.replace('.json', ''),
-                    "session_start": self.current_session[0]['timestamp'],
-                    "session_end": timestamp.isoformat(),
-                    "total_messages": len(self.current_session),
-                    "user_messages": len(user_messages),
-                    "ai_messages": len(ai_messages),
-                    "total_user_chars": sum(m['message_length'] for m in user_messages),
-                    "total_ai_chars": sum(m['response_length'] for m in ai_messages),
-                    "total_user_words": sum(m['message_words'] for m in user_messages),
-                    "total_ai_words": sum(m['response_words'] for m in ai_messages),
-                    "autosave": autosave,
-                    "session_duration_seconds": (
-                        datetime.fromisoformat(self.current_session[-1]['timestamp']) - 
-                        datetime.fromisoformat(self.current_session[0]['timestamp'])
-                    ).total_seconds() if len(self.current_session) > 1 else 0
-                },
-                "messages": self.current_session
+            timestamp = datetime.now()
+            metadata = {
+                "session_id": self.session_id,
+                "session_start": self.current_session[0]['timestamp'],
+                "session_end": timestamp.isoformat(),
+                "total_messages": len(self.current_session),
+                "user_messages": self._user_messages,
+                "ai_messages": self._ai_messages,
+                "total_user_chars": self._user_chars,
+                "total_ai_chars": self._ai_chars,
+                "total_user_words": self._user_words,
+                "total_ai_words": self._ai_words,
+                "autosave": autosave,
+                "session_duration_seconds": self._session_seconds()
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
-            
-            if not autosave:
-                print(f"💾 Chat session saved: {filename}")
-            else:
-                print(f"💾 Autosaved session: {filename}")
+            meta_path = self.logs_dir / f"{self.session_id}.meta.json"
+            meta_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
             
+            print(f"💾 Chat session saved: {filepath.name}")
             return filepath
             
         except Exception as e:
@@ -113,43 +215,43 @@ class ChatLogger:
         if not self.current_session:
             return {}
         
-        user_messages = [m for m in self.current_session if m['user'] == 'user']
-        ai_messages = [m for m in self.current_session if m['user'] == 'ai']
-        
         return {
             "total_messages": len(self.current_session),
-            "user_messages": len(user_messages),
-            "ai_messages": len(ai_messages),
-            "total_user_chars": sum(m['message_length'] for m in user_messages),
-            "total_ai_chars": sum(m['response_length'] for m in ai_messages),
+            "user_messages": self._user_messages,
+            "ai_messages": self._ai_messages,
+            "total_user_chars": self._user_chars,
+            "total_ai_chars": self._ai_chars,
             "session_duration": self._get_session_duration()
         }
     
+    def _session_seconds(self) -> float:
+        """Seconds between the first and last logged message"""
+        if len(self.current_session) < 2:
+            return 0
+        return self.current_session[-1]['_ts_epoch'] - self.current_session[0]['_ts_epoch']
+    
     def _get_session_duration(self) -> str:
         """Calculate session duration"""
         if not self.current_session:
             return "0 seconds"
         
         try:
-            start = datetime.fromisoformat(self.current_session[0]['timestamp'])
-            end = datetime.fromisoformat(self.current_session[-1]['timestamp'])
-            duration = end - start
-            return str(duration)
+            return str(timedelta(seconds=self._session_seconds()))
         except:
             return "Unknown"
     
     def load_session(self, session_id: str) -> List[Dict]:
         """Load a specific session from file"""
-        filepath = self.logs_dir / f"{session_id}.json"
+        filepath = self.logs_dir / f"{session_id}.jsonl"
+        if not filepath.exists():
+            filepath = self.logs_dir / f"{session_id}.json"
         
         if not filepath.exists():
             print(f"❌ Session file not found: {session_id}")
             return []
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
-            return session_data.get('messages', [])
+            return read_session_messages(filepath)
         except Exception as e:
             print(f"❌ Error loading session {session_id}: {e}")
             return []
@@ -159,13 +261,14 @@ class ChatLogger:
         sessions = []
         cutoff_time = datetime.now().timestamp() - (days * 24 * 60 * 60)
         
-        for session_file in self.logs_dir.glob("session_*.json"):
-            if session_file.stat().st_mtime >= cutoff_time:
+        for entry in scan_session_entries(self.logs_dir):
+            st = entry.stat()
+            if st.st_mtime >= cutoff_time:
                 sessions.append({
-                    "filename": session_file.name,
-                    "size_kb": round(session_file.stat().st_size / 1024, 2),
-                    "modified": datetime.fromtimestamp(session_file.stat().st_mtime),
-                    "path": str(session_file)
+                    "filename": entry.name,
+                    "size_kb": round(st.st_size / 1024, 2),
+                    "modified": datetime.fromtimestamp(st.st_mtime),
+                    "path": entry.path
                 })
         
         return sorted(sessions, key=lambda x: x['modified'], reverse=True)
@@ -175,10 +278,12 @@ class ChatLogger:
         cutoff_time = datetime.now().timestamp() - (days_to_keep * 24 * 60 * 60)
         deleted_count = 0
         
-        for session_file in self.logs_dir.glob("session_*.json"):
-            if session_file.stat().st_mtime < cutoff_time:
+        for entry in scan_session_entries(self.logs_dir):
+            if entry.stat().st_mtime < cutoff_time:
+                session_file = Path(entry.path)
                 try:
                     session_file.unlink()
+                    session_file.with_suffix(".meta.json").unlink(missing_ok=True)
                     deleted_count += 1
                 except Exception as e:
                     print(f"❌ Error deleting {session_file.name}: {e}")
@@ -188,12 +293,13 @@ class ChatLogger:
     def stop(self):
         """Stop the logger and save current session"""
         self._stop_auto_save = True
-        if self._auto_save_thread and self._auto_save_thread.is_alive():
-            self._auto_save_thread.join(timeout=2.0)
+        if self._timer:
+            self._timer.cancel()
         
         if self.current_session:
             self.save_session()
             print("✅ Chat logger stopped and session saved")
+        self._close_log_file()
     
     def export_session(self, session_id: str, format: str = "json") -> bool:
         """Export session to different formats"""
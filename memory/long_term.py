@@ -1,49 +1,218 @@
 # memory/long_term.py
+import atexit
 import sqlite3
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
 import shutil
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+# Statements are kept as constants so the connection's statement cache always hits
+_SQL_INVALIDATE = '''
+    UPDATE facts SET valid_until = ?
+    WHERE subject = ? AND attribute = ? AND valid_until IS NULL
+'''
+_SQL_INSERT = '''
+    INSERT INTO facts (subject, attribute, value, valid_from, valid_until)
+    VALUES (?, ?, ?, ?, NULL)
+'''
+# At most one row per (subject, attribute) is live, so no id tie-break is needed
+_SQL_GET_CURRENT = '''
+    SELECT value, valid_from
+    FROM facts
+    WHERE subject = ? AND attribute = ? AND valid_until IS NULL
+    ORDER BY valid_from DESC LIMIT 1
+'''
+_SQL_GET_HISTORY = '''
+    SELECT value, valid_from, valid_until
+    FROM facts
+    WHERE subject = ? AND attribute = ?
+    ORDER BY valid_from DESC, id DESC
+    LIMIT ? OFFSET ?
+'''
+_SQL_GET_AT_TIME = '''
+    SELECT value, valid_from, valid_until
+    FROM facts
+    WHERE subject = ? AND attribute = ?
+    AND valid_from <= ? AND COALESCE(valid_until, 9223372036854775807) >= ?
+    ORDER BY valid_from DESC, id DESC LIMIT 1
+'''
+_SQL_GET_RELATED = '''
+    SELECT attribute, value, confidence
+    FROM facts
+    WHERE subject = ? AND valid_until IS NULL
+    AND (attribute = ? OR attribute LIKE ? ESCAPE '\\')
+    ORDER BY confidence DESC, valid_from DESC
+    LIMIT ?
+'''
+# Timestamps are stored as integer Unix epoch seconds
+_SQL_NOW = "SELECT CAST(strftime('%s', 'now') AS INTEGER)"
+_SQL_COUNT_FACTS = 'SELECT COUNT(*) FROM facts'
+_SQL_COUNT_CURRENT = 'SELECT COUNT(*) FROM facts WHERE valid_until IS NULL'
+
+# Most current-fact rows memoized per instance before the cache is emptied
+CURRENT_CACHE_SIZE = 1024
+
+# Run PRAGMA optimize after this many fact writes (and always on close)
+OPTIMIZE_EVERY_WRITES = 500
+
+# PRAGMA user_version of the current schema; 1 = epoch-second timestamps,
+# 2 = superseded indexes dropped
+_SCHEMA_VERSION = 2
+
+# Companion files of a WAL-mode database; they hold committed but uncheckpointed data
+_WAL_SUFFIXES = ('', '-wal', '-shm')
+
+def _is_corruption_error(error: sqlite3.DatabaseError) -> bool:
+    """True for errors that mean the file is damaged, not merely locked or busy."""
+    message = str(error).lower()
+    return 'malformed' in message or 'not a database' in message
+
+def _to_epoch(moment) -> int:
+    """Bind form of a timestamp: datetimes become epoch seconds, ints pass through."""
+    return int(moment.timestamp()) if isinstance(moment, datetime) else moment
+
+def _from_epoch(seconds) -> Optional[datetime]:
+    """Local datetime for a stored epoch timestamp (None stays None)."""
+    return None if seconds is None else datetime.fromtimestamp(seconds)
+
 class LongTermMemory:
+    # Database directories already ensured by an earlier instance
+    _dirs_created: set = set()
+    
     def __init__(self, db_path: str = 'memory/jarvis_memory.db'):
         # Ensure the memory directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        db_dir = os.path.dirname(db_path)
+        if db_dir and db_dir not in self._dirs_created:
+            os.makedirs(db_dir, exist_ok=True)
+            self._dirs_created.add(db_dir)
         
         self.db_path = db_path
         self.backup_path = f"{db_path}.backup"
+        # Written on clean exit; lets the next start skip the corruption check
+        self.clean_shutdown_path = f"{db_path}.clean_shutdown"
+        
+        # One long-lived connection per instance; the lock serializes access to it
+        self.conn = None
+        self._lock = threading.Lock()
+        # Current-fact rows by (subject, attribute); cleared on every write through this
+        # instance and whenever PRAGMA data_version shows another connection committed
+        self._current_cache: Dict[Tuple[str, str], Optional[tuple]] = {}
+        self._data_version = None
+        # Facts written since the planner statistics were last refreshed
+        self._writes_since_optimize = 0
         self._init_database()
+        atexit.register(self.close)
     
-    def _is_database_corrupted(self) -> bool:
-        """Check if the database is corrupted."""
+    @staticmethod
+    def _configure(conn: sqlite3.Connection):
+        """Apply WAL journaling and the per-connection tuning PRAGMAs."""
+        conn.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; "
+            "PRAGMA temp_store=MEMORY; PRAGMA cache_size=-20000; "
+            "PRAGMA mmap_size=268435456; PRAGMA foreign_keys=ON; "
+            # Checkpoint every ~1000 pages and truncate the WAL back to 64 MB afterwards
+            "PRAGMA wal_autocheckpoint=1000; PRAGMA journal_size_limit=67108864;"
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a configured connection in autocommit mode; every connection goes through here."""
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
+        self._configure(conn)
+        return conn
+    
+    def _open_connection(self):
+        """Open the shared connection."""
+        self.conn = self._connect()
+    
+    @contextmanager
+    def _cursor(self):
+        """Yield a cursor on the shared connection while holding the lock."""
+        with self._lock:
+            c = self.conn.cursor()
+            try:
+                yield c
+            finally:
+                c.close()
+    
+    def _close_connection(self):
+        """Close the shared connection, ignoring errors from a broken database."""
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+            self.conn = None
+    
+    def close(self):
+        """Close the shared connection and mark the database as cleanly shut down."""
+        with self._lock:
+            if self.conn is None:
+                return
+            # Refresh planner statistics for tables that changed enough to need it
+            try:
+                self.conn.execute('PRAGMA optimize')
+            except sqlite3.Error:
+                pass
+            self._close_connection()
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.execute("PRAGMA integrity_check;")
-            conn.close()
+            Path(self.clean_shutdown_path).touch()
+        except OSError:
+            pass
+    
+    def _consume_clean_shutdown_marker(self) -> bool:
+        """True if the last run shut down cleanly and the file is unchanged since; removes the marker."""
+        try:
+            marker_mtime = os.stat(self.clean_shutdown_path).st_mtime
+            os.remove(self.clean_shutdown_path)
+            return os.stat(self.db_path).st_mtime <= marker_mtime
+        except OSError:
             return False
-        except sqlite3.DatabaseError:
-            return True
+    
+    def _is_database_corrupted(self) -> bool:
+        """Check if the database is corrupted; skipped after a clean shutdown."""
+        if self._consume_clean_shutdown_marker():
+            return False
+        try:
+            conn = self._connect()
+            try:
+                result = conn.execute("PRAGMA quick_check;").fetchone()
+            finally:
+                conn.close()
+            return result is None or result[0] != 'ok'
+        except sqlite3.DatabaseError as e:
+            return _is_corruption_error(e)
     
     def _backup_corrupted_database(self):
-        """Backup the corrupted database before recreating it."""
+        """Backup the corrupted database, with its -wal/-shm files, before recreating it."""
         if os.path.exists(self.db_path):
             try:
-                if os.path.exists(self.backup_path):
-                    os.remove(self.backup_path)
-                shutil.copy2(self.db_path, self.backup_path)
+                for suffix in _WAL_SUFFIXES:
+                    if os.path.exists(self.backup_path + suffix):
+                        os.remove(self.backup_path + suffix)
+                    if os.path.exists(self.db_path + suffix):
+                        shutil.copy2(self.db_path + suffix, self.backup_path + suffix)
                 print(f"⚠️ Backed up corrupted database to {self.backup_path}")
             except Exception as e:
                 print(f"❌ Failed to backup corrupted database: {e}")
     
     def _recreate_database(self):
         """Recreate the database from scratch."""
+        self._close_connection()
+        self._current_cache.clear()
+        self._data_version = None
         self._backup_corrupted_database()
         
-        # Remove the corrupted database
+        # Remove the corrupted database; a stale -wal/-shm would be replayed into the new one
         if os.path.exists(self.db_path):
             try:
-                os.remove(self.db_path)
+                for suffix in _WAL_SUFFIXES:
+                    if os.path.exists(self.db_path + suffix):
+                        os.remove(self.db_path + suffix)
                 print(f"🗑️ Removed corrupted database: {self.db_path}")
             except Exception as e:
                 print(f"❌ Failed to remove corrupted database: {e}")
@@ -54,10 +223,19 @@ class LongTermMemory:
         # Reinitialize the database
         self._init_tables()
     
+    def _handle_database_error(self, error: sqlite3.DatabaseError, operation: str):
+        """Recreate the database only when the error means it is corrupted."""
+        if _is_corruption_error(error):
+            print(f"❌ Database error in {operation}: {error}. Recreating database...")
+            self._recreate_database()
+        else:
+            print(f"❌ Database error in {operation}: {error}")
+    
     def _init_tables(self):
         """Initialize database tables without error handling."""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        if self.conn is None:
+            self._open_connection()
+        c = self.conn.cursor()
         
         # Table for storing facts with version history
         c.execute('''
@@ -66,8 +244,8 @@ class LongTermMemory:
                 subject TEXT NOT NULL,
                 attribute TEXT NOT NULL,
                 value TEXT NOT NULL,
-                valid_from DATETIME NOT NULL,
-                valid_until DATETIME,
+                valid_from INTEGER NOT NULL,
+                valid_until INTEGER,
                 confidence REAL DEFAULT 1.0,
                 source TEXT DEFAULT 'user_input',
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
@@ -75,12 +253,47 @@ class LongTermMemory:
         ''')
         
         # Add indexes for better performance
-        c.execute('CREATE INDEX IF NOT EXISTS idx_facts_subject_attr ON facts(subject, attribute)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_facts_valid_from ON facts(valid_from)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_facts_valid_until ON facts(valid_until)')
+        # History and point-in-time lookups: the rowid is the implicit last column,
+        # so ORDER BY valid_from, id is read straight off the index
+        c.execute('CREATE INDEX IF NOT EXISTS idx_facts_history ON facts(subject, attribute, valid_from)')
+        # Partial covering index over live rows only: get_current_fact never reads the table
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_facts_current
+            ON facts(subject, attribute, valid_from, value, valid_until) WHERE valid_until IS NULL
+        ''')
         
-        conn.commit()
-        conn.close()
+        self._migrate(c)
+    
+    def _migrate(self, c: sqlite3.Cursor):
+        """Bring an older database up to _SCHEMA_VERSION."""
+        version = c.execute('PRAGMA user_version').fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        
+        c.execute('BEGIN IMMEDIATE')
+        try:
+            if version < 1:
+                # v1: timestamps used to be local-time text; convert them to epoch seconds
+                # (the DATETIME columns have numeric affinity, so integers stay integers)
+                c.execute('''
+                    UPDATE facts SET valid_from = CAST(strftime('%s', valid_from, 'utc') AS INTEGER)
+                    WHERE typeof(valid_from) = 'text'
+                ''')
+                c.execute('''
+                    UPDATE facts SET valid_until = CAST(strftime('%s', valid_until, 'utc') AS INTEGER)
+                    WHERE typeof(valid_until) = 'text'
+                ''')
+            if version < 2:
+                # v2: (subject, attribute) is a prefix of idx_facts_history, and the
+                # single-column indexes led the planner to scan across subjects
+                c.execute('DROP INDEX IF EXISTS idx_facts_subject_attr')
+                c.execute('DROP INDEX IF EXISTS idx_facts_valid_from')
+                c.execute('DROP INDEX IF EXISTS idx_facts_valid_until')
+            c.execute(f'PRAGMA user_version = {_SCHEMA_VERSION}')
+            c.execute('COMMIT')
+        except Exception:
+            c.execute('ROLLBACK')
+            raise
     
     def _init_database(self):
         """Initialize the database with corruption recovery."""
@@ -98,158 +311,164 @@ class LongTermMemory:
                 self._init_tables()
                 print(f"✅ Created new database: {self.db_path}")
                 
-        except Exception as e:
+        except sqlite3.DatabaseError as e:
+            if not _is_corruption_error(e):
+                raise
             print(f"❌ Critical error initializing database: {e}")
             self._recreate_database()
     
-    def _execute_safe(self, query: str, params: tuple = None):
-        """Execute SQL query with error handling and automatic recovery."""
+    def add_fact(self, subject: str, attribute: str, value: str, valid_from: datetime = None):
+        """
+        Add a new fact or update an existing one with versioning.
+        The old value is closed and the new one inserted in one transaction.
+        """
+        return self.add_facts([(subject, attribute, value)], valid_from)
+    
+    def add_facts(self, triples: List[Tuple], valid_from: datetime = None) -> bool:
+        """
+        Add several (subject, attribute, value) facts in a single transaction.
+        A fact may carry its own valid_from as a fourth element; otherwise the
+        batch valid_from applies, or a timestamp taken by SQLite once per batch.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            if params:
-                c.execute(query, params)
-            else:
-                c.execute(query)
+            with self._cursor() as c:
+                c.execute('BEGIN IMMEDIATE')
+                try:
+                    if valid_from is None:
+                        valid_from = c.execute(_SQL_NOW).fetchone()[0]
+                    else:
+                        valid_from = _to_epoch(valid_from)
+                    for subject, attribute, value, *when in triples:
+                        since = _to_epoch(when[0]) if when else valid_from
+                        c.execute(_SQL_INVALIDATE, (since, subject, attribute))
+                        c.execute(_SQL_INSERT, (subject, attribute, value, since))
+                    c.execute('COMMIT')
+                except Exception:
+                    c.execute('ROLLBACK')
+                    raise
+                self._current_cache.clear()
                 
-            conn.commit()
-            conn.close()
+                self._writes_since_optimize += len(triples)
+                if self._writes_since_optimize >= OPTIMIZE_EVERY_WRITES:
+                    self._writes_since_optimize = 0
+                    # The batch is already committed; a failed optimize must not
+                    # trigger recovery or report the write as lost
+                    try:
+                        c.execute('PRAGMA optimize')
+                    except sqlite3.Error:
+                        pass
             return True
             
         except sqlite3.DatabaseError as e:
-            print(f"❌ Database error: {e}. Attempting recovery...")
-            self._recreate_database()
+            self._handle_database_error(e, "add_facts")
             return False
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
             return False
     
-    def add_fact(self, subject: str, attribute: str, value: str, valid_from: datetime = None):
-        """
-        Add a new fact or update an existing one with versioning.
-        """
-        valid_from = valid_from or datetime.now()
-        
-        # First, invalidate any current fact for this subject+attribute
-        self._execute_safe('''
-            UPDATE facts SET valid_until = ?
-            WHERE subject = ? AND attribute = ? AND valid_until IS NULL
-        ''', (valid_from, subject, attribute))
-        
-        # Insert the new fact as current
-        success = self._execute_safe('''
-            INSERT INTO facts (subject, attribute, value, valid_from, valid_until)
-            VALUES (?, ?, ?, ?, NULL)
-        ''', (subject, attribute, value, valid_from))
-        
-        return success
+    def _get_current_cached(self, subject: str, attribute: str) -> Optional[tuple]:
+        """Current (value, valid_from) row, memoized until the database changes."""
+        with self._cursor() as c:
+            # data_version changes when any other connection (or process) commits
+            data_version = c.execute('PRAGMA data_version').fetchone()[0]
+            if data_version != self._data_version or len(self._current_cache) >= CURRENT_CACHE_SIZE:
+                self._current_cache.clear()
+                self._data_version = data_version
+            key = (subject, attribute)
+            if key not in self._current_cache:
+                c.execute(_SQL_GET_CURRENT, key)
+                self._current_cache[key] = c.fetchone()
+            return self._current_cache[key]
     
     def get_current_fact(self, subject: str, attribute: str) -> Optional[Dict]:
         """Get the current value of a fact."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            c.execute('''
-                SELECT value, valid_from 
-                FROM facts 
-                WHERE subject = ? AND attribute = ? AND valid_until IS NULL
-                ORDER BY valid_from DESC LIMIT 1
-            ''', (subject, attribute))
-            
-            result = c.fetchone()
-            conn.close()
+            result = self._get_current_cached(subject, attribute)
             
             if result:
-                return {'value': result[0], 'valid_from': result[1]}
+                return {'value': result[0], 'valid_from': _from_epoch(result[1])}
             return None
             
-        except sqlite3.DatabaseError:
-            print("❌ Database error in get_current_fact, recreating database...")
-            self._recreate_database()
+        except sqlite3.DatabaseError as e:
+            self._handle_database_error(e, "get_current_fact")
             return None
     
-    def get_fact_history(self, subject: str, attribute: str) -> List[Dict]:
-        """Get complete history of a fact with timestamps."""
+    def get_fact_history(self, subject: str, attribute: str, limit: int = 100, offset: int = 0) -> List[Dict]:
+        """
+        Get the history of a fact with timestamps, newest first, one page at a time.
+        Callers needing the full history should request pages until one comes back short.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            c.execute('''
-                SELECT value, valid_from, valid_until 
-                FROM facts 
-                WHERE subject = ? AND attribute = ?
-                ORDER BY valid_from DESC
-            ''', (subject, attribute))
-            
-            history = []
-            for row in c.fetchall():
-                history.append({
-                    'value': row[0],
-                    'valid_from': row[1],
-                    'valid_until': row[2]
-                })
+            with self._cursor() as c:
+                c.execute(_SQL_GET_HISTORY, (subject, attribute, limit, offset))
+                return [
+                    {'value': row[0], 'valid_from': _from_epoch(row[1]), 'valid_until': _from_epoch(row[2])}
+                    for row in c.fetchall()
+                ]
             
-            conn.close()
-            return history
-            
-        except sqlite3.DatabaseError:
-            print("❌ Database error in get_fact_history, recreating database...")
-            self._recreate_database()
+        except sqlite3.DatabaseError as e:
+            self._handle_database_error(e, "get_fact_history")
             return []
     
     def get_fact_at_time(self, subject: str, attribute: str, target_time: datetime) -> Optional[Dict]:
         """Get what a fact was at a specific point in time."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            c.execute('''
-                SELECT value, valid_from, valid_until 
-                FROM facts 
-                WHERE subject = ? AND attribute = ? 
-                AND valid_from <= ? AND (valid_until >= ? OR valid_until IS NULL)
-                ORDER BY valid_from DESC LIMIT 1
-            ''', (subject, attribute, target_time, target_time))
-            
-            result = c.fetchone()
-            conn.close()
+            with self._cursor() as c:
+                target = _to_epoch(target_time)
+                c.execute(_SQL_GET_AT_TIME, (subject, attribute, target, target))
+                result = c.fetchone()
             
             if result:
                 return {
                     'value': result[0],
-                    'valid_from': result[1],
-                    'valid_until': result[2]
+                    'valid_from': _from_epoch(result[1]),
+                    'valid_until': _from_epoch(result[2])
                 }
             return None
             
-        except sqlite3.DatabaseError:
-            print("❌ Database error in get_fact_at_time, recreating database...")
-            self._recreate_database()
+        except sqlite3.DatabaseError as e:
+            self._handle_database_error(e, "get_fact_at_time")
             return None
 
+    def get_related_facts(self, subject: str, attribute: str, limit: int = 20) -> List[Dict]:
+        """Get current facts whose attribute equals or starts with the given one, most confident first."""
+        # Match attribute literally as a prefix: escape LIKE's wildcards
+        prefix = attribute.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        try:
+            with self._cursor() as c:
+                c.execute(_SQL_GET_RELATED, (subject, attribute, prefix, limit))
+                return [
+                    {'attribute': row[0], 'value': row[1], 'confidence': row[2]}
+                    for row in c.fetchall()
+                ]
+            
+        except sqlite3.DatabaseError as e:
+            self._handle_database_error(e, "get_related_facts")
+            return []
+
     def get_database_info(self) -> Dict:
         """Get information about the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            
-            # Get number of facts
-            c.execute('SELECT COUNT(*) FROM facts')
-            total_facts = c.fetchone()[0]
-            
-            # Get number of current facts
-            c.execute('SELECT COUNT(*) FROM facts WHERE valid_until IS NULL')
-            current_facts = c.fetchone()[0]
+            with self._cursor() as c:
+                # Get number of facts
+                c.execute(_SQL_COUNT_FACTS)
+                total_facts = c.fetchone()[0]
+                
+                # Get number of current facts
+                c.execute(_SQL_COUNT_CURRENT)
+                current_facts = c.fetchone()[0]
             
-            conn.close()
+            # One stat call; also safe if the file vanishes in between
+            try:
+                database_size = os.stat(self.db_path).st_size
+            except FileNotFoundError:
+                database_size = 0
             
             return {
                 'database_path': self.db_path,
                 'total_facts': total_facts,
                 'current_facts': current_facts,
-                'database_size': os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0
+                'database_size': database_size
             }
             
         except Exception as e:
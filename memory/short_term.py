@@ -1,8 +1,12 @@
 # memory/short_term.py
 from collections import deque
 
-# Store the last 6 exchanges for context (increased from 5 for better context)
-conversation_history = deque(maxlen=6)
+# Store the last 6 exchanges for context (increased from 5 for better context),
+# each as a (user, ai) tuple
+_conversation_history = deque(maxlen=6)
+
+# The same exchanges pre-formatted for LLM context, kept in step with _conversation_history
+_formatted_history = deque(maxlen=_conversation_history.maxlen)
 
 def add_to_history(user_input, ai_response):
     """
@@ -12,33 +16,30 @@ def add_to_history(user_input, ai_response):
         user_input (str): The user's message
         ai_response (str): The AI's response
     """
-    conversation_history.append({"user": user_input, "ai": ai_response})
+    _conversation_history.append((user_input, ai_response))
+    _formatted_history.append(f"User: {user_input}\nAssistant: {ai_response}\n")
 
 def get_recent_history():
     """
     Retrieves the recent conversation history for context.
     
     Returns:
-        list: The last few conversation turns
+        list: The last few conversation turns as {"user": ..., "ai": ...} dicts
     """
-    return list(conversation_history)
+    return [{"user": user, "ai": ai} for user, ai in _conversation_history]
 
 def clear_history():
     """
     Clears the conversation history.
     """
-    conversation_history.clear()
+    _conversation_history.clear()
+    _formatted_history.clear()
 
 def get_formatted_history():
     """
     Returns the conversation history in a formatted string for LLM context.
     """
-    if not conversation_history:
+    if not _formatted_history:
         return ""
     
-    formatted = "\nRecent conversation history:\n"
-    for exchange in conversation_history:
-        formatted += f"User: {exchange['user']}\n"
-        formatted += f"Assistant: {exchange['ai']}\n"
-    
-    return formatted
\ No newline at end of file
+    return "\nRecent conversation history:\n" + "".join(_formatted_history)
\ No newline at end of file
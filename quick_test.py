@@ -4,12 +4,29 @@ Quick test script to verify:
 1. API keys import from .env
 2. Keys visible in api_manager
 3. OpenAIClient works
+
+Pass a number (python quick_test.py 5) to also fire that many parallel probes
+through the same client.
 """
 
+import asyncio
+import sys
+
 from brain.api_manager import api_manager
 from brain.llm_clients.openai_client import OpenAIClient
 
-def main():
+PING = [{"role": "user", "content": "Hello, reply with only the word 'pong'"}]
+
+async def run_probes(client, count):
+    """Send count completions at once through one client (and its open connections)"""
+    results = await asyncio.gather(
+        *(asyncio.to_thread(client.chat_completion, messages=PING) for _ in range(count)),
+        return_exceptions=True,
+    )
+    failures = sum(isinstance(r, Exception) for r in results)
+    print(f"[5] {count - failures}/{count} parallel probe(s) succeeded.")
+
+def main(probes=0):
     print("=== Quick Test: API Manager & OpenAI Client ===")
 
     # 1. Import keys from .env
@@ -24,8 +41,8 @@ def main():
         if hasattr(api_manager, "get_unmasked_keys"):
             db_keys = api_manager.get_unmasked_keys("openai")
             print(f"[2] DB contains {len(db_keys)} unmasked key(s).")
-            for k in db_keys:
-                print(f"    - Priority {k['priority']}: {k['api_key']}")
+            for priority, key in enumerate(db_keys, 1):
+                print(f"    - Priority {priority}: {key[:7]}...{key[-4:]}")
         else:
             print("[2] api_manager.get_unmasked_keys not available.")
             db_keys = []
@@ -44,14 +61,17 @@ def main():
     # 4. Run a sample completion
     try:
         print("[4] Sending test message to OpenAI...")
-        resp = client.chat_completion(
-            messages=[{"role": "user", "content": "Hello, reply with only the word 'pong'"}]
-        )
+        resp = client.chat_completion(messages=PING)
         print("AI Response:", resp)
     except Exception as e:
         print(f"[4] Error during chat completion: {e}")
 
+    # 5. Optional stress mode: parallel probes, no throttling between them
+    if probes > 0:
+        client.min_request_interval = 0
+        asyncio.run(run_probes(client, probes))
+
     print("=== Test Complete ===")
 
 if __name__ == "__main__":
-    main()
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
@@ -9,6 +9,11 @@ print("Files in directory:", os.listdir('.'))
 load_dotenv()
 
 # Check if keys are loaded
-print("OPENAI_API_KEY_1:", os.getenv("OPENAI_API_KEY_1"))
-print("OPENAI_API_KEY:", os.getenv("OPENAI_API_KEY"))
-print("All environment variables:", dict(os.environ))
\ No newline at end of file
+print("OPENAI_API_KEY_1:", "set" if os.getenv("OPENAI_API_KEY_1") else "not set")
+print("OPENAI_API_KEY:", "set" if os.getenv("OPENAI_API_KEY") else "not set")
+# Only the variables this project reads, with values masked
+print("Project environment variables:")
+for name in sorted(os.environ):
+    if name.startswith(("OPENAI_", "GROQ_", "JARVIS_", "GEMINI_", "DEEPSEEK_", "ANTHROPIC_", "NEWS_")):
+        value = os.environ[name]
+        print(f"  {name}: {value[:4]}...{value[-4:]}" if len(value) > 8 else f"  {name}: (set)")
\ No newline at end of file
@@ -1,4 +1,5 @@
 # test_groq.py
+import asyncio
 from groq_ai import GroqAI
 
 def test_groq_integration():
@@ -25,8 +26,18 @@ def test_groq_integration():
     )
     print("Response:", response)
     
+    # Test async query
+    print("\n3. Testing async query...")
+    response = asyncio.run(groq.aget_response("Name three primary colours"))
+    print("Response:", response)
+    
+    # Test streaming
+    print("\n4. Testing streamed query...")
+    for sentence in groq.stream_response("Describe the sea in three sentences"):
+        print("Sentence:", sentence)
+    
     # Test available models
-    print("\n3. Available models:")
+    print("\n5. Available models:")
     models = groq.get_available_models()
     for model in models:
         print(f"   - {model}")